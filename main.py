@@ -1,6 +1,9 @@
-from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.caching import enable_llm_cache
+from tradingagents.graph.runner import analyze
 from tradingagents.default_config import DEFAULT_CONFIG
-from datetime import date
+
+# Serve repeated (model, prompt) requests from a local SQLite cache
+enable_llm_cache()
 
 
 # Create a custom config
@@ -21,12 +24,14 @@ config["max_risk_discuss_rounds"] = 1  # Increase debate rounds
 config["online_tools"] = True  # Increase debate rounds
 
 
-# Initialize with custom config
-ta = TradingAgentsGraph(debug=True, config=config)
+def main():
+    # forward propagate
+    decision = analyze("000875", config)
+    print(decision)
+
+    # Memorize mistakes and reflect
+    # get_graph(config).reflect_and_remember(1000) # parameter is the position returns
 
-# forward propagate
-_, decision = ta.propagate("000875", trade_date = date.today().strftime("%Y-%m-%d"))
-print(decision)
 
-# Memorize mistakes and reflect
-# ta.reflect_and_remember(1000) # parameter is the position returns
+if __name__ == "__main__":
+    main()
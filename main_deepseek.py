@@ -1,6 +1,11 @@
-from tradingagents.graph.trading_graph import TradingAgentsGraph
+import threading
+
+from tradingagents.caching import enable_llm_cache
+from tradingagents.graph.runner import analyze, get_graph
 from tradingagents.default_config import DEFAULT_CONFIG
-from datetime import date
+
+# Serve repeated (model, prompt) requests from a local SQLite cache
+enable_llm_cache()
 
 
 # Create a custom config
@@ -20,20 +25,21 @@ config["max_risk_discuss_rounds"] = 1  # Increase debate rounds
 
 config["online_tools"] = True  # Increase debate rounds
 
+#selected_analysts = ("market", "social", "news", "fundamentals")
+selected_analysts = ("fundamentals",)
+
 
-# Initialize with custom config
-ta = TradingAgentsGraph(
-    #selected_analysts=["market", "social", "news", "fundamentals"],
-    selected_analysts=["fundamentals"],
-    debug=True, 
-    config=config
-    )
+if __name__ == "__main__":
+    # Warm up LLM connections and data chains in the background while the first run starts
+    # Worker 0 is the graph analyze() uses by default, so the first run finds it warm
+    graph = get_graph(config, selected_analysts)
+    threading.Thread(target=graph._warmup, daemon=True).start()
 
-# forward propagate
-#_, decision = ta.propagate("0175.HK", trade_date = date.today().strftime("%Y-%m-%d"))
-#_, decision = ta.propagate("NVDA", trade_date = date.today().strftime("%Y-%m-%d"))
-_, decision = ta.propagate("600999", trade_date = date.today().strftime("%Y-%m-%d"))
-print(decision)
+    # forward propagate
+    #decision = analyze("0175.HK", config, selected_analysts)
+    #decision = analyze("NVDA", config, selected_analysts)
+    decision = analyze("600999", config, selected_analysts)
+    print(decision)
 
-# Memorize mistakes and reflect
-# ta.reflect_and_remember(1000) # parameter is the position returns
+    # Memorize mistakes and reflect
+    # get_graph(config, selected_analysts).reflect_and_remember(1000) # parameter is the position returns
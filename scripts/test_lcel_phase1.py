@@ -32,27 +32,37 @@ async def run_test():
 
     print("--- Starting Phase 1 LCEL Refactoring Verification Test ---\n")
 
-    for test in test_cases:
+    # Each test case is an independent, I/O-bound fetch, so run them concurrently.
+    # The semaphore caps how many requests hit the upstream APIs at the same time.
+    semaphore = asyncio.Semaphore(4)
+
+    async def fetch(input_data):
+        async with semaphore:
+            # The graph expects a dictionary with a 'ticker' key.
+            return await news_fetcher_graph.ainvoke(input_data)
+
+    results = await asyncio.gather(
+        *[fetch(test["input"]) for test in test_cases],
+        return_exceptions=True
+    )
+
+    for test, result in zip(test_cases, results):
         market = test["market"]
         input_data = test["input"]
         ticker = input_data["ticker"]
 
         print(f"--- Testing {market}: {input_data} ---")
-        try:
-            # The graph expects a dictionary with a 'ticker' key.
-            # We use ainvoke for asynchronous execution.
-            result = await news_fetcher_graph.ainvoke(input_data)
-
-            print(f"SUCCESS: News fetched for {ticker}.")
-            print("--- Result Preview (first 500 characters) ---")
-            # Ensure the output is encoded correctly for printing
-            print(result[:500].encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
-            print("-------------------------------------------\n")
-
-        except Exception as e:
+        if isinstance(result, Exception):
             print(f"FAILED: An error occurred while fetching news for {ticker}.")
-            print(f"Error details: {e}\n")
-            logging.exception(f"Exception for ticker {ticker}:")
+            print(f"Error details: {result}\n")
+            logging.error(f"Exception for ticker {ticker}:", exc_info=result)
+            continue
+
+        print(f"SUCCESS: News fetched for {ticker}.")
+        print("--- Result Preview (first 500 characters) ---")
+        # Ensure the output is encoded correctly for printing
+        print(result[:500].encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
+        print("-------------------------------------------\n")
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ A final test to validate the integration of the simplified unified news tool.
 
 import os
 import sys
+import asyncio
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -28,10 +29,20 @@ def test_final_integration():
             {"code": "AAPL", "type": "US-share", "name": "Apple Inc."}
         ]
 
-        for case in test_cases:
+        # The fetches are independent and I/O-bound, so run them concurrently.
+        async def fetch_all():
+            return await asyncio.gather(
+                *[get_stock_news_unified.ainvoke({"stock_code": case["code"]}) for case in test_cases],
+                return_exceptions=True
+            )
+
+        results = asyncio.run(fetch_all())
+
+        for case, result in zip(test_cases, results):
             print(f"\n🔍 Testing {case['type']}: {case['code']} ({case['name']})")
-            # Use .invoke() for the new @tool
-            result = get_stock_news_unified.invoke({"stock_code": case["code"]})
+            if isinstance(result, Exception):
+                print(f"  ⚠️ Could not fetch news: {result}")
+                continue
 
             if result and len(result) > 50:
                 print(f"  ✅ News fetched successfully ({len(result)} chars)")
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from langchain_core.runnables import RunnableLambda
+
+TICKERS = ["600519", "0700.HK", "AAPL", "MSFT", "TSLA", "AAPL", " ", "BAD"]
+MAX_CONCURRENCY = 2
+
+
+class TestFundamentalsBatchChain(unittest.TestCase):
+
+    def setUp(self):
+        from tradingagents.chains import fundamentals_data_chain
+        self.running = 0
+        self.peak = 0
+        self.calls = []
+        self.lock = threading.Lock()
+
+        async def fetch(ticker):
+            with self.lock:
+                self.calls.append(ticker)
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            try:
+                await asyncio.sleep(0.05)
+                if ticker == "BAD":
+                    raise RuntimeError("provider down")
+                return f"report for {ticker}"
+            finally:
+                with self.lock:
+                    self.running -= 1
+
+        def fetch_sync(ticker):
+            raise AssertionError("the batch chain must use the async path of the single chain")
+
+        # Replace the single-ticker chain with an async stub that tracks its concurrency.
+        self._patcher = patch.object(
+            fundamentals_data_chain,
+            'create_fundamentals_data_chain',
+            lambda: RunnableLambda(fetch_sync, afunc=fetch),
+        )
+        self._patcher.start()
+        self.chain = fundamentals_data_chain.create_fundamentals_batch_chain(max_concurrency=MAX_CONCURRENCY)
+
+    def tearDown(self):
+        self._patcher.stop()
+
+    def _check(self, reports):
+        self.assertEqual(list(reports), ["600519", "0700.HK", "AAPL", "MSFT", "TSLA", "BAD"])
+        for ticker in ("600519", "0700.HK", "AAPL", "MSFT", "TSLA"):
+            self.assertEqual(reports[ticker], f"report for {ticker}")
+        # One failing ticker is reported in place without affecting the others.
+        self.assertTrue(reports["BAD"].startswith("⚠️ BAD 基本面数据获取失败"))
+        # Duplicates and blanks are dropped before fetching.
+        self.assertEqual(sorted(self.calls), sorted(["600519", "0700.HK", "AAPL", "MSFT", "TSLA", "BAD"]))
+        self.assertEqual(self.peak, MAX_CONCURRENCY)
+
+    def test_invoke_returns_per_ticker_reports(self):
+        """The sync path runs the batch through run_coroutine_sync and honours max_concurrency."""
+        self._check(self.chain.invoke(TICKERS))
+
+    def test_ainvoke_returns_per_ticker_reports(self):
+        """The async path gives the same reports under the same concurrency limit."""
+        self._check(asyncio.run(self.chain.ainvoke(TICKERS)))
+
+    def test_invoke_inside_running_loop(self):
+        """invoke still works when called from code that already runs an event loop."""
+        async def run():
+            return self.chain.invoke(TICKERS)
+
+        self._check(asyncio.run(run()))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
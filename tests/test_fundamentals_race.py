@@ -0,0 +1,76 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from langchain_core.runnables import RunnableLambda
+
+# Seconds the slow provider takes; the race must return well before it finishes.
+SLOW_PROVIDER_SECONDS = 2.0
+FAST_PROVIDER_SECONDS = 0.1
+FAST_REPORT = "Fast provider fundamentals report for AAPL with enough content to be valid."
+
+
+def _slow_provider(x):
+    time.sleep(SLOW_PROVIDER_SECONDS)
+    return "Slow provider fundamentals report for AAPL."
+
+
+def _fast_provider(x):
+    time.sleep(FAST_PROVIDER_SECONDS)
+    return FAST_REPORT
+
+
+class TestFundamentalsProviderRace(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from tradingagents.chains import fundamentals_data_chain
+
+        # Replace the US primaries with stubs: Finnhub is slow, Yahoo is fast.
+        cls._patchers = [
+            patch.object(fundamentals_data_chain, 'get_us_data_finnhub', RunnableLambda(_slow_provider)),
+            patch.object(fundamentals_data_chain, 'get_us_data_yahoo', RunnableLambda(_fast_provider)),
+        ]
+        for patcher in cls._patchers:
+            patcher.start()
+
+        # The fetch steps are memoized; rebuild them with the stubbed providers.
+        fundamentals_data_chain._create_fetch_steps.cache_clear()
+        # The router sends a non-A-share, non-HK market to the US chain and invokes it.
+        _, cls.us_chain = fundamentals_data_chain._create_fetch_steps()
+        cls.context = {"ticker": "AAPL", "market_type": "美股"}
+
+    @classmethod
+    def tearDownClass(cls):
+        from tradingagents.chains import fundamentals_data_chain
+        for patcher in cls._patchers:
+            patcher.stop()
+        fundamentals_data_chain._create_fetch_steps.cache_clear()
+
+    def test_invoke_returns_first_valid_result(self):
+        """The sync path must not wait for the slow provider."""
+        started = time.perf_counter()
+        result = self.us_chain.invoke(self.context)
+        elapsed = time.perf_counter() - started
+
+        self.assertIn(FAST_REPORT, result[0])
+        self.assertLess(elapsed, SLOW_PROVIDER_SECONDS / 2)
+        print(f"✅ invoke returned in {elapsed:.2f}s")
+
+    def test_ainvoke_returns_first_valid_result(self):
+        """The async path must not wait for the slow provider either."""
+        async def run():
+            started = time.perf_counter()
+            result = await self.us_chain.ainvoke(self.context)
+            return result, time.perf_counter() - started
+
+        result, elapsed = asyncio.run(run())
+
+        self.assertIn(FAST_REPORT, result[0])
+        self.assertLess(elapsed, SLOW_PROVIDER_SECONDS / 2)
+        print(f"✅ ainvoke returned in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from langchain_core.runnables import RunnableLambda
+
+MARKET_INFO = {"market_name": "美股", "currency_name": "美元", "currency_symbol": "$"}
+CONTEXT = {"ticker": "AAPL", "market_info": MARKET_INFO, "curr_date": "2025-01-02"}
+SECTIONS = ["## 🇺🇸 美股数据\nMock US fundamentals", "## Extra section"]
+
+
+class TestFundamentalsStreamChain(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from tradingagents.chains import fundamentals_data_chain
+        from tradingagents.tools.fundamentals_lcel_tools import format_fundamentals_report
+
+        # Replace the fetch steps with stubs so the chain runs without any data provider.
+        cls._patcher = patch.object(
+            fundamentals_data_chain,
+            '_create_fetch_steps',
+            lambda: (RunnableLambda(lambda ticker: dict(CONTEXT, ticker=ticker)), RunnableLambda(lambda x: SECTIONS)),
+        )
+        cls._patcher.start()
+        fundamentals_data_chain.create_fundamentals_stream_chain.cache_clear()
+        cls.chain = fundamentals_data_chain.create_fundamentals_stream_chain()
+
+        cls.expected = format_fundamentals_report.invoke(dict(CONTEXT, results=SECTIONS))
+
+    @classmethod
+    def tearDownClass(cls):
+        from tradingagents.chains import fundamentals_data_chain
+        cls._patcher.stop()
+        fundamentals_data_chain.create_fundamentals_stream_chain.cache_clear()
+
+    def test_invoke_matches_report_chain(self):
+        """The sync invoke path joins the streamed chunks into the full report."""
+        self.assertEqual(self.chain.invoke("AAPL"), self.expected)
+
+    def test_stream_yields_header_first(self):
+        """The sync stream path yields the header as its own chunk before the data sections."""
+        chunks = list(self.chain.stream("AAPL"))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(chunks[0].startswith("# AAPL 基本面分析报告"))
+        self.assertEqual("".join(chunks), self.expected)
+
+    def test_async_paths_match_sync(self):
+        """ainvoke and astream produce the same report as the sync paths."""
+        async def run():
+            joined = await self.chain.ainvoke("AAPL")
+            chunks = [chunk async for chunk in self.chain.astream("AAPL")]
+            return joined, "".join(chunks)
+
+        joined, streamed = asyncio.run(run())
+        self.assertEqual(joined, self.expected)
+        self.assertEqual(streamed, self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
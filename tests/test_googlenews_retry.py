@@ -0,0 +1,42 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from tradingagents.dataflows import googlenews_utils
+
+
+class TestGoogleNewsRetry(unittest.TestCase):
+
+    def setUp(self):
+        self.session = MagicMock()
+        self._patchers = [
+            patch.object(googlenews_utils, 'get_shared_requests_session', return_value=self.session),
+            # Skip the anti-detection delay and the tenacity backoff.
+            patch.object(googlenews_utils.time, 'sleep'),
+            patch.object(googlenews_utils.make_request.retry, 'sleep', lambda seconds: None),
+        ]
+        for patcher in self._patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self._patchers:
+            patcher.stop()
+
+    def test_connection_error_is_not_retried_again(self):
+        """The shared session already retries connection failures, so make_request gives up at once."""
+        self.session.get.side_effect = requests.exceptions.ConnectionError("unreachable")
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            googlenews_utils.make_request("https://www.google.com/search", {})
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_rate_limit_is_retried(self):
+        """A 429 response is still retried with backoff."""
+        self.session.get.side_effect = [MagicMock(status_code=429), MagicMock(status_code=200)]
+        response = googlenews_utils.make_request("https://www.google.com/search", {})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.session.get.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -1,4 +1,3 @@
-
 import unittest
 from unittest.mock import patch, MagicMock
 import logging
@@ -9,95 +8,91 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 # Ensure the logger for the wrapper is available
 logger = logging.getLogger('tradingagents.tools.unified_fundamentals_wrapper')
 
+# (ticker, chain return value or exception, expected fragments, exact match)
+WRAPPER_CASES = [
+    (
+        "AAPL",
+        "## 📈 AAPL 基本面分析报告\\n- **数据来源**: 模拟数据源\\n- **分析**: 模拟分析内容",
+        ["AAPL 基本面分析报告", "模拟分析内容"],
+        False,
+    ),
+    (
+        "FAIL.TICKER",
+        ValueError("LCEL chain execution failed"),
+        ["在为 FAIL.TICKER 获取基本面数据时，统一接口发生严重错误", "LCEL chain execution failed"],
+        False,
+    ),
+    (
+        "600519",
+        "Mock A-Share Report",
+        ["Mock A-Share Report"],
+        True,
+    ),
+]
+
 
 class TestUnifiedFundamentalsWrapper(unittest.TestCase):
 
-    @patch('tradingagents.tools.unified_fundamentals_wrapper.create_fundamentals_data_chain')
-    def test_successful_invocation(self, mock_create_chain):
-        """
-        Tests a successful call to the unified fundamentals tool wrapper.
-        """
-        print("\\n--- Running Test: test_successful_invocation ---")
+    @classmethod
+    def setUpClass(cls):
+        # The chain factory is memoized; clear it so the suite starts without a cached chain.
+        from tradingagents.chains.fundamentals_data_chain import create_fundamentals_data_chain
+        create_fundamentals_data_chain.cache_clear()
 
-        # Arrange: Configure the mock chain to return a successful report
-        mock_chain_instance = MagicMock()
-        mock_chain_instance.invoke.return_value = "## 📈 AAPL 基本面分析报告\\n- **数据来源**: 模拟数据源\\n- **分析**: 模拟分析内容"
-        mock_create_chain.return_value = mock_chain_instance
+        # Patch the factory once for the whole class instead of once per test.
+        cls._patcher = patch(
+            'tradingagents.tools.unified_fundamentals_wrapper.create_fundamentals_data_chain',
+            autospec=True,
+        )
+        cls.mock_create_chain = cls._patcher.start()
 
-        # Dynamically import the tool after setting up mocks if needed, or ensure it's loaded correctly
         from tradingagents.tools.unified_fundamentals_wrapper import get_stock_fundamentals_unified
+        cls.tool = get_stock_fundamentals_unified
 
-        # Act: Call the tool's invoke method
-        ticker_to_test = "AAPL"
-        result = get_stock_fundamentals_unified.invoke({"ticker": ticker_to_test})
-
-        # Assert: Verify the behavior
-        # 1. Check that the chain creator was called
-        mock_create_chain.assert_called_once()
-
-        # 2. Check that the chain's invoke method was called with the correct ticker
-        mock_chain_instance.invoke.assert_called_once_with(ticker_to_test)
-
-        # 3. Check that the result is the expected report
-        self.assertIn("AAPL 基本面分析报告", result)
-        self.assertIn("模拟分析内容", result)
-
-        print(f"✅ Test Passed: Successfully invoked wrapper for {ticker_to_test} and got expected report.")
-
-    @patch('tradingagents.tools.unified_fundamentals_wrapper.create_fundamentals_data_chain')
-    def test_invocation_with_exception(self, mock_create_chain):
-        """
-        Tests how the wrapper handles an exception from the underlying LCEL chain.
-        """
-        print("\\n--- Running Test: test_invocation_with_exception ---")
+    @classmethod
+    def tearDownClass(cls):
+        cls._patcher.stop()
 
-        # Arrange: Configure the mock chain to raise an exception
+    def _arrange(self, mock_result):
+        """Resets the shared factory mock and returns a fresh chain mock producing `mock_result`."""
+        self.mock_create_chain.reset_mock()
         mock_chain_instance = MagicMock()
-        mock_chain_instance.invoke.side_effect = ValueError("LCEL chain execution failed")
-        mock_create_chain.return_value = mock_chain_instance
-
-        from tradingagents.tools.unified_fundamentals_wrapper import get_stock_fundamentals_unified
-
-        # Act: Call the tool's invoke method, expecting an error
-        ticker_to_test = "FAIL.TICKER"
-        result = get_stock_fundamentals_unified.invoke({"ticker": ticker_to_test})
-
-        # Assert: Verify the error handling
-        # 1. Check that the chain creator was called
-        mock_create_chain.assert_called_once()
-
-        # 2. Check that the chain's invoke method was called
-        mock_chain_instance.invoke.assert_called_once_with(ticker_to_test)
-
-        # 3. Check that the result is a user-friendly error message
-        self.assertIn(f"在为 {ticker_to_test} 获取基本面数据时，统一接口发生严重错误", result)
-        self.assertIn("LCEL chain execution failed", result)
-
-        print(f"✅ Test Passed: Correctly handled exception for {ticker_to_test}.")
-
-    @patch('tradingagents.tools.unified_fundamentals_wrapper.create_fundamentals_data_chain')
-    def test_tool_with_a_share_ticker(self, mock_create_chain):
+        if isinstance(mock_result, Exception):
+            mock_chain_instance.invoke.side_effect = mock_result
+        else:
+            mock_chain_instance.invoke.return_value = mock_result
+        self.mock_create_chain.return_value = mock_chain_instance
+        return mock_chain_instance
+
+    def test_wrapper_invocation(self):
         """
-        Tests the wrapper with a sample A-share ticker.
+        Tests the unified fundamentals tool wrapper for successful reports, A-share tickers
+        and exceptions raised by the underlying LCEL chain.
         """
-        print("\\n--- Running Test: test_tool_with_a_share_ticker ---")
+        for ticker_to_test, mock_result, expected, exact in WRAPPER_CASES:
+            with self.subTest(ticker=ticker_to_test):
+                print(f"\\n--- Running Test: test_wrapper_invocation[{ticker_to_test}] ---")
 
-        # Arrange
-        mock_chain_instance = MagicMock()
-        mock_chain_instance.invoke.return_value = "Mock A-Share Report"
-        mock_create_chain.return_value = mock_chain_instance
+                # Arrange
+                mock_chain_instance = self._arrange(mock_result)
 
-        from tradingagents.tools.unified_fundamentals_wrapper import get_stock_fundamentals_unified
+                # Act: Call the tool's invoke method
+                result = self.tool.invoke({"ticker": ticker_to_test})
+
+                # Assert: Verify the behavior
+                # 1. Check that the chain creator was called
+                self.mock_create_chain.assert_called_once()
 
-        # Act
-        ticker_to_test = "600519"
-        result = get_stock_fundamentals_unified.invoke({"ticker": ticker_to_test})
+                # 2. Check that the chain's invoke method was called with the correct ticker
+                mock_chain_instance.invoke.assert_called_once_with(ticker_to_test)
 
-        # Assert
-        mock_chain_instance.invoke.assert_called_once_with(ticker_to_test)
-        self.assertEqual(result, "Mock A-Share Report")
+                # 3. Check that the result is the expected report or a user-friendly error message
+                if exact:
+                    self.assertEqual(result, expected[0])
+                for fragment in expected:
+                    self.assertIn(fragment, result)
 
-        print(f"✅ Test Passed: Wrapper correctly handled A-share ticker {ticker_to_test}.")
+                print(f"✅ Test Passed: Wrapper correctly handled {ticker_to_test}.")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+
+from langchain_core.runnables import RunnableLambda
+import logging
+
+# Configure logging to capture output for tests
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+import tradingagents.tools.unified_news_wrapper as wrapper
+
+VALID_REPORT = "## AAPL news\n" + "Apple announces quarterly results and new products. " * 3
+SHORT_REPORT = "AAPL: nothing"
+FAILURE_REPORT = "❌ 未获取到 AAPL 的新闻数据，所有数据源均返回失败，请稍后重试。" * 2
+
+
+class TestUnifiedNewsWrapper(unittest.TestCase):
+
+    @staticmethod
+    def _reset_caches():
+        wrapper._REPORT_CACHE.clear()
+        wrapper._NEGATIVE_CACHE.clear()
+        wrapper._CACHE_STATS.clear()
+
+    def setUp(self):
+        self._reset_caches()
+        self._patcher = patch.object(wrapper, 'create_news_data_chain', autospec=True)
+        self.mock_create_chain = self._patcher.start()
+        self.chain = MagicMock()
+        self.mock_create_chain.return_value = self.chain
+
+    def tearDown(self):
+        self._patcher.stop()
+
+    def _stream_then_invoke(self, report):
+        """Streams `report` once, then returns what a following invoke call gets."""
+        self.chain.stream.return_value = iter([report[:10], report[10:]])
+        list(wrapper.stream_stock_news_unified("AAPL"))
+        self.chain.invoke.return_value = "invoke should not be reached when the stream outcome is cached"
+        return wrapper.get_stock_news_unified.invoke({"stock_code": "AAPL"})
+
+    def test_stream_and_invoke_cache_the_same_outcome(self):
+        """A streamed result is cached under the same rules the invoke path applies."""
+        cases = [
+            (VALID_REPORT, VALID_REPORT),
+            (SHORT_REPORT, wrapper._empty_notice("AAPL")),
+            (FAILURE_REPORT, FAILURE_REPORT),
+        ]
+        for streamed, expected in cases:
+            with self.subTest(streamed=streamed[:20]):
+                self._reset_caches()
+                self.chain.reset_mock()
+                self.assertEqual(self._stream_then_invoke(streamed), expected)
+                self.chain.invoke.assert_not_called()
+
+    def test_short_stream_appends_notice(self):
+        """A short streamed report is followed by the same notice invoke would return."""
+        self.chain.stream.return_value = iter([SHORT_REPORT])
+        chunks = list(wrapper.stream_stock_news_unified("AAPL"))
+        self.assertEqual(chunks, [SHORT_REPORT, wrapper._empty_notice("AAPL")])
+
+    def test_stream_paths_respect_fetch_deadline(self):
+        """A hung provider cannot block a streaming caller past the fetch deadline."""
+        def hung_stream(_):
+            yield "## AAPL news\n"
+            time.sleep(2)
+            yield "never reached"
+
+        async def hung_astream(_):
+            yield "## AAPL news\n"
+            await asyncio.sleep(2)
+            yield "never reached"
+
+        async def collect():
+            return [chunk async for chunk in wrapper.astream_stock_news_unified("AAPL")]
+
+        self.chain.stream.side_effect = hung_stream
+        self.chain.astream.side_effect = hung_astream
+        timeout_notice = "⚠️ 获取 AAPL 的新闻数据超时"
+        with patch.object(wrapper, '_FETCH_TIMEOUT', 0.2):
+            for name, run in (
+                ("stream", lambda: list(wrapper.stream_stock_news_unified("AAPL"))),
+                ("astream", lambda: asyncio.run(collect())),
+            ):
+                with self.subTest(path=name):
+                    self._reset_caches()
+                    started = time.perf_counter()
+                    chunks = run()
+                    elapsed = time.perf_counter() - started
+
+                    self.assertLess(elapsed, 1.0)
+                    self.assertEqual(chunks[0], "## AAPL news\n")
+                    self.assertTrue(chunks[-1].startswith(timeout_notice))
+                    # The timeout is remembered briefly, like on the invoke paths.
+                    self.assertTrue(wrapper._NEGATIVE_CACHE.get("AAPL").startswith(timeout_notice))
+
+    def test_coalesced_calls_are_counted_separately(self):
+        """Concurrent calls for one ticker run the chain once and are reported as coalesced."""
+        callers = 4
+        barrier = threading.Barrier(callers)
+
+        def slow_invoke(_):
+            time.sleep(0.3)
+            return VALID_REPORT
+
+        def call(_):
+            barrier.wait()
+            return wrapper.get_stock_news_unified.invoke({"stock_code": "0700.HK"})
+
+        self.chain.invoke.side_effect = slow_invoke
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            reports = list(executor.map(call, range(callers)))
+
+        self.assertEqual(reports, [VALID_REPORT] * callers)
+        self.assertEqual(self.chain.invoke.call_count, 1)
+        self.assertEqual(
+            wrapper.get_cache_stats(),
+            {("HK-share", "miss"): 1, ("HK-share", "coalesced"): callers - 1},
+        )
+
+    def test_stream_paths_record_cache_outcome(self):
+        """Streaming calls are counted like invoke calls: a miss first, then a hit."""
+        self.chain.stream.side_effect = lambda _: iter([VALID_REPORT])
+        list(wrapper.stream_stock_news_unified("AAPL"))
+        list(wrapper.stream_stock_news_unified("AAPL"))
+        self.assertEqual(wrapper.get_cache_stats(), {("US-share", "miss"): 1, ("US-share", "hit"): 1})
+
+    @unittest.skipUnless(wrapper.ZSTD_AVAILABLE, "zstandard is not installed")
+    def test_report_is_held_compressed_only_in_the_wrapper(self):
+        """The report cache stores the only copy, compressed, and serves it back decompressed."""
+        self.chain.invoke.return_value = VALID_REPORT
+        wrapper.get_stock_news_unified.invoke({"stock_code": "AAPL"})
+
+        stored = wrapper._REPORT_CACHE.get("AAPL")
+        self.assertIsInstance(stored, bytes)
+        self.assertLess(len(stored), len(VALID_REPORT.encode("utf-8")))
+        self.assertEqual(wrapper.get_stock_news_unified.invoke({"stock_code": "AAPL"}), VALID_REPORT)
+        self.assertEqual(self.chain.invoke.call_count, 1)
+
+class TestNewsCacheLayering(unittest.TestCase):
+
+    def setUp(self):
+        from tradingagents.chains import news_data_chain
+        TestUnifiedNewsWrapper._reset_caches()
+        self.google_calls = 0
+
+        def google(_):
+            self.google_calls += 1
+            return SHORT_REPORT
+
+        # HK tickers go to Google News first; it succeeds with a too-short report.
+        self._patcher = patch.object(news_data_chain, 'google_news_tool', RunnableLambda(google))
+        self._patcher.start()
+        news_data_chain._build_news_data_chain.cache_clear()
+
+    def tearDown(self):
+        from tradingagents.chains import news_data_chain
+        self._patcher.stop()
+        news_data_chain._build_news_data_chain.cache_clear()
+
+    def test_retry_after_negative_entry_expires_fetches_again(self):
+        """Only the wrapper caches news, so an expired negative entry leads to a new fetch."""
+        first = wrapper.get_stock_news_unified.invoke({"stock_code": "0700.HK"})
+        self.assertEqual(first, wrapper._empty_notice("0700.HK"))
+        self.assertEqual(self.google_calls, 1)
+
+        wrapper._NEGATIVE_CACHE.clear()  # what expiry of the 60s entry does
+        wrapper.get_stock_news_unified.invoke({"stock_code": "0700.HK"})
+        self.assertEqual(self.google_calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
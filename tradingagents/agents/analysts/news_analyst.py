@@ -1,4 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+import asyncio
 import time
 import json
 from datetime import datetime
@@ -15,6 +16,48 @@ from tradingagents.agents.utils.google_tool_handler import GoogleToolCallHandler
 
 logger = get_logger("analysts.news")
 
+_NEWS_SYSTEM_MESSAGE = (
+    """您是一位专业的财经新闻分析师，负责分析最新的市场新闻和事件对股票价格的潜在影响。
+
+您的主要职责包括：
+1. 获取和分析最新的实时新闻（优先15-30分钟内的新闻）
+2. 评估新闻事件的紧急程度和市场影响
+3. 识别可能影响股价的关键信息
+4. 分析新闻的时效性和可靠性
+5. 提供基于新闻的交易建议和价格影响评估
+
+重点关注的新闻类型：
+- 财报发布和业绩指导
+- 重大合作和并购消息
+- 政策变化和监管动态
+- 突发事件和危机管理
+- 行业趋势和技术突破
+- 管理层变动和战略调整
+
+分析要点：
+- 新闻的时效性（发布时间距离现在多久）
+- 新闻的可信度（来源权威性）
+- 市场影响程度（对股价的潜在影响）
+- 投资者情绪变化（正面/负面/中性）
+- 与历史类似事件的对比
+
+📊 价格影响分析要求：
+- 评估新闻对股价的短期影响（1-3天）
+- 分析可能的价格波动幅度（百分比）
+- 提供基于新闻的价格调整建议
+- 识别关键价格支撑位和阻力位
+- 评估新闻对长期投资价值的影响
+- 不允许回复'无法评估价格影响'或'需要更多信息'
+
+请特别注意：
+⚠️ 如果新闻数据存在滞后（超过2小时），请在分析中明确说明时效性限制
+✅ 优先分析最新的、高相关性的新闻事件
+📊 提供新闻对股价影响的量化评估和具体价格预期
+💰 必须包含基于新闻的价格影响分析和调整建议
+
+请撰写详细的中文分析报告，并在报告末尾附上Markdown表格总结关键发现。"""
+)
+
 
 def create_news_analyst(llm):
     @log_analyst_module("news")
@@ -99,47 +142,7 @@ def create_news_analyst(llm):
 
         direct_news = get_stock_news_unified.invoke({"stock_code": ticker})
 
-        system_message = (
-            """您是一位专业的财经新闻分析师，负责分析最新的市场新闻和事件对股票价格的潜在影响。
-
-您的主要职责包括：
-1. 获取和分析最新的实时新闻（优先15-30分钟内的新闻）
-2. 评估新闻事件的紧急程度和市场影响
-3. 识别可能影响股价的关键信息
-4. 分析新闻的时效性和可靠性
-5. 提供基于新闻的交易建议和价格影响评估
-
-重点关注的新闻类型：
-- 财报发布和业绩指导
-- 重大合作和并购消息
-- 政策变化和监管动态
-- 突发事件和危机管理
-- 行业趋势和技术突破
-- 管理层变动和战略调整
-
-分析要点：
-- 新闻的时效性（发布时间距离现在多久）
-- 新闻的可信度（来源权威性）
-- 市场影响程度（对股价的潜在影响）
-- 投资者情绪变化（正面/负面/中性）
-- 与历史类似事件的对比
-
-📊 价格影响分析要求：
-- 评估新闻对股价的短期影响（1-3天）
-- 分析可能的价格波动幅度（百分比）
-- 提供基于新闻的价格调整建议
-- 识别关键价格支撑位和阻力位
-- 评估新闻对长期投资价值的影响
-- 不允许回复'无法评估价格影响'或'需要更多信息'
-
-请特别注意：
-⚠️ 如果新闻数据存在滞后（超过2小时），请在分析中明确说明时效性限制
-✅ 优先分析最新的、高相关性的新闻事件
-📊 提供新闻对股价影响的量化评估和具体价格预期
-💰 必须包含基于新闻的价格影响分析和调整建议
-
-请撰写详细的中文分析报告，并在报告末尾附上Markdown表格总结关键发现。"""
-        )
+        system_message = _NEWS_SYSTEM_MESSAGE
 
         prompt = ChatPromptTemplate.from_messages(
             [
@@ -350,4 +353,37 @@ def create_news_analyst(llm):
             "news_report": report,
         }
 
+    async def astream_news_report(state):
+        """
+        流式生成新闻分析报告
+
+        先获取新闻数据，再通过 llm.astream 逐块产出 AIMessageChunk，
+        调用方可以在第一个 token 到达时立即开始渲染，而无需等待完整报告生成。
+        """
+        ticker = state["company_of_interest"]
+        current_date = state["trade_date"]
+        logger.info(f"[新闻分析师] 流式模式开始分析 {ticker} 的新闻，交易日期: {current_date}")
+
+        news = await get_stock_news_unified.ainvoke({"stock_code": ticker})
+        stream_prompt = f"""
+您是一位专业的财经新闻分析师。请基于以下已获取的最新新闻数据，对股票 {ticker} 进行详细分析：
+
+=== 最新新闻数据 ===
+{news}
+
+=== 分析要求 ===
+{_NEWS_SYSTEM_MESSAGE}
+
+供您参考，当前日期是{current_date}。请基于上述真实新闻数据撰写详细的中文分析报告。
+"""
+        async for chunk in llm.astream([{"role": "user", "content": stream_prompt}]):
+            yield chunk
+
+    async def ainvoke_news_analyst(state):
+        """异步调用新闻分析师，在工作线程中运行同步节点，不阻塞事件循环"""
+        return await asyncio.to_thread(news_analyst_node, state)
+
+    news_analyst_node.astream = astream_news_report
+    news_analyst_node.ainvoke = ainvoke_news_analyst
+
     return news_analyst_node
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+LLM 响应缓存
+为分析图启用 LangChain 全局 LLM 缓存，相同 (模型, 提示词) 的重复请求直接从本地 SQLite 读取
+"""
+
+import re
+from typing import Any, Optional, Sequence
+
+from langchain_core.caches import BaseCache, InMemoryCache
+from langchain_core.globals import set_llm_cache
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('default')
+
+try:
+    from langchain_community.cache import SQLiteCache
+    SQLITE_CACHE_AVAILABLE = True
+except ImportError:
+    SQLITE_CACHE_AVAILABLE = False
+
+DEFAULT_LLM_CACHE_PATH = ".langchain_llm_cache.db"
+
+# 提示词中的易变字段，作为缓存键前会被替换为占位符（例如新闻数据的获取时间戳）
+DEFAULT_CACHE_IGNORE_FIELDS = (
+    r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:\.\d+)?",  # 精确到秒的时间戳
+)
+
+
+class StablePromptCache(BaseCache):
+    """包装另一个缓存，在查找/写入前去除提示词中的易变字段，使缓存键保持稳定"""
+
+    def __init__(self, inner: BaseCache, cache_ignore_fields: Sequence[str] = DEFAULT_CACHE_IGNORE_FIELDS):
+        """
+        初始化缓存包装器
+
+        Args:
+            inner: 实际存储数据的缓存
+            cache_ignore_fields: 需要从缓存键中忽略的正则表达式列表
+        """
+        self.inner = inner
+        self._volatile = re.compile("|".join(f"(?:{p})" for p in cache_ignore_fields)) if cache_ignore_fields else None
+
+    def _normalize(self, prompt: str) -> str:
+        return self._volatile.sub("<volatile>", prompt) if self._volatile else prompt
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Any]:
+        return self.inner.lookup(self._normalize(prompt), llm_string)
+
+    def update(self, prompt: str, llm_string: str, return_val: Any) -> None:
+        self.inner.update(self._normalize(prompt), llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.inner.clear(**kwargs)
+
+
+def enable_llm_cache(
+    database_path: str = DEFAULT_LLM_CACHE_PATH,
+    cache_ignore_fields: Sequence[str] = DEFAULT_CACHE_IGNORE_FIELDS,
+) -> BaseCache:
+    """
+    启用全局 LLM 响应缓存
+
+    单进程开发/测试使用 SQLite；多进程部署可改为传入 RedisCache 等共享缓存实现。
+    langchain_community 不可用时退回进程内缓存。
+
+    Args:
+        database_path: SQLite 缓存文件路径
+        cache_ignore_fields: 需要从缓存键中忽略的易变字段（正则表达式）
+
+    Returns:
+        BaseCache: 已设置为全局缓存的实例
+    """
+    if SQLITE_CACHE_AVAILABLE:
+        inner = SQLiteCache(database_path=database_path)
+        logger.info(f"💾 [LLM缓存] 已启用SQLite缓存: {database_path}")
+    else:
+        inner = InMemoryCache()
+        logger.warning("⚠️ [LLM缓存] langchain_community 未安装，使用进程内缓存")
+
+    cache = StablePromptCache(inner, cache_ignore_fields)
+    set_llm_cache(cache)
+    return cache
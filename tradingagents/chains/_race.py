@@ -0,0 +1,190 @@
+# tradingagents/chains/_race.py
+"""
+Helpers for racing several data providers against each other inside an LCEL chain.
+
+Instead of paying a full timeout for every failed provider in a sequential
+`with_fallbacks` tower, the providers are started together and the first result
+that passes validation wins; the remaining calls are cancelled.
+
+The same validation is used to turn empty or failure results into exceptions, since
+`with_fallbacks` only advances to the next provider when the current one raises.
+"""
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, List, Optional
+
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+from tradingagents.utils.result_cache import is_valid_result
+
+logger = logging.getLogger(__name__)
+
+
+class NoValidResultError(RuntimeError):
+    """Raised when none of the raced providers produced a valid result."""
+
+
+class EmptyResultError(ValueError):
+    """Raised when a provider returned an empty or failure result, so that a fallback runs."""
+
+
+class NoDataError(RuntimeError):
+    """Raised when every provider for a market failed; the message is user-facing."""
+
+
+def _require_valid(result: Any, validator: Callable[[Any], bool] = is_valid_result) -> Any:
+    if not validator(result):
+        raise EmptyResultError(f"Provider returned an empty or failure result: {str(result)[:80]!r}")
+    return result
+
+
+def with_result_validation(
+    runnable: Runnable,
+    validator: Callable[[Any], bool] = is_valid_result,
+) -> Runnable:
+    """
+    Pipes `runnable` into a check that raises EmptyResultError for invalid results.
+
+    Use it on every provider but the last in a `with_fallbacks` tower so that a
+    silently empty result advances to the next provider instead of being returned.
+    """
+    return runnable | RunnableLambda(lambda result: _require_valid(result, validator))
+
+
+def require_result(
+    chain: Runnable,
+    error_message: Callable[[Any], str],
+    validator: Callable[[Any], bool] = is_valid_result,
+) -> Runnable:
+    """
+    Wraps `chain` so that an exception or an invalid result surfaces as NoDataError.
+
+    The error carries `error_message(x)`, so the caller can report the failure once at
+    the top level instead of passing a sentinel string through (and into the cache).
+    """
+    def _check(x, result):
+        if not validator(result):
+            raise NoDataError(error_message(x))
+        return result
+
+    def _invoke(x, config: RunnableConfig):
+        try:
+            result = chain.invoke(x, config)
+        except NoDataError:
+            raise
+        except Exception as e:
+            raise NoDataError(error_message(x)) from e
+        return _check(x, result)
+
+    async def _ainvoke(x, config: RunnableConfig):
+        try:
+            result = await chain.ainvoke(x, config)
+        except NoDataError:
+            raise
+        except Exception as e:
+            raise NoDataError(error_message(x)) from e
+        return _check(x, result)
+
+    return RunnableLambda(_invoke, afunc=_ainvoke)
+
+
+async def race_with_validation(
+    providers: List[Runnable],
+    x: Any,
+    validator: Callable[[Any], bool] = is_valid_result,
+    per_task_timeout: float = 15.0,
+) -> Any:
+    """
+    Invokes all providers concurrently and returns the first result accepted by `validator`.
+
+    Each provider call is bounded by `per_task_timeout` seconds. Pending calls are
+    cancelled as soon as a valid result arrives. Raises NoValidResultError if every
+    provider fails, times out, or returns an invalid result.
+    """
+    tasks = [
+        asyncio.ensure_future(asyncio.wait_for(provider.ainvoke(x), per_task_timeout))
+        for provider in providers
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                result = await next_done
+            except Exception as e:
+                logger.debug(f"Provider failed during race: {type(e).__name__}: {e}")
+                continue
+            if validator(result):
+                return result
+    finally:
+        for task in tasks:
+            task.cancel()
+    raise NoValidResultError(f"No provider returned a valid result out of {len(providers)}")
+
+
+def race_with_validation_sync(
+    providers: List[Runnable],
+    x: Any,
+    validator: Callable[[Any], bool] = is_valid_result,
+    per_task_timeout: float = 15.0,
+) -> Any:
+    """
+    Synchronous counterpart of `race_with_validation`.
+
+    The providers run on a dedicated thread pool and the first valid result is returned
+    right away; the pool is shut down without waiting, so slower providers never delay
+    the caller (threads cannot be interrupted, so they finish in the background).
+    All providers start together, so `per_task_timeout` bounds the whole race.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="race")
+    futures = [
+        executor.submit(contextvars.copy_context().run, provider.invoke, x)
+        for provider in providers
+    ]
+    try:
+        for next_done in as_completed(futures, timeout=per_task_timeout):
+            try:
+                result = next_done.result()
+            except Exception as e:
+                logger.debug(f"Provider failed during race: {type(e).__name__}: {e}")
+                continue
+            if validator(result):
+                return result
+    except FuturesTimeoutError:
+        logger.debug(f"Race timed out after {per_task_timeout}s")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    raise NoValidResultError(f"No provider returned a valid result out of {len(providers)}")
+
+
+def create_race_runnable(
+    providers: List[Runnable],
+    fallback: Optional[Runnable] = None,
+    validator: Callable[[Any], bool] = is_valid_result,
+    per_task_timeout: float = 15.0,
+) -> Runnable:
+    """
+    Wraps `race_with_validation` in a Runnable with both sync and async paths.
+
+    If a `fallback` is given, it is invoked only when the race produces no valid result;
+    otherwise NoValidResultError propagates so an outer `with_fallbacks` can handle it.
+    Both paths return as soon as the first valid result arrives.
+    """
+    def _race(x):
+        try:
+            return race_with_validation_sync(providers, x, validator, per_task_timeout)
+        except NoValidResultError:
+            if fallback is None:
+                raise
+            return fallback.invoke(x)
+
+    async def _arace(x):
+        try:
+            return await race_with_validation(providers, x, validator, per_task_timeout)
+        except NoValidResultError:
+            if fallback is None:
+                raise
+            return await fallback.ainvoke(x)
+
+    return RunnableLambda(_race, afunc=_arace)
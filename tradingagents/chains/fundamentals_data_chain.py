@@ -1,81 +1,176 @@
 # tradingagents/chains/fundamentals_data_chain.py
-from langchain_core.runnables import RunnableBranch, RunnableLambda, RunnablePassthrough
+from functools import lru_cache
+from langchain_core.runnables import RunnableGenerator, RunnableLambda
+from tradingagents.chains._race import (
+    NoDataError, create_race_runnable, require_result, with_result_validation
+)
 from tradingagents.tools.fundamentals_lcel_tools import (
     market_identifier_tool,
     get_a_share_fundamentals_optimized,
     get_hk_data_akshare_wip, get_hk_data_yahoo_wip, get_hk_data_finnhub_wip,
     get_us_data_finnhub, get_us_data_openai, get_us_data_yahoo,
-    format_fundamentals_report
+    format_fundamentals_report, iter_fundamentals_report, aiter_fundamentals_report,
+    FAILED_SECTION_PREFIX
 )
+from tradingagents.utils.async_utils import run_coroutine_sync
+from tradingagents.utils.result_cache import is_valid_result, with_result_cache
+from tradingagents.utils.ttl_cache import TTLCache
 from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Iterator, List
+import logging
 
-def create_fundamentals_data_chain():
-    """
-    Creates an integrated LCEL chain for fetching fundamental data,
-    handling different markets and fallbacks automatically.
+logger = logging.getLogger(__name__)
 
-    The chain takes a ticker string as input and returns a formatted report string.
+# Market identification is a pure function of the ticker, so results are cached
+# to collapse repeated lookups (retries, fallbacks, multiple analysts) into one.
+_MARKET_INFO_CACHE = TTLCache(maxsize=4096, ttl=3600)
+
+
+def _identify_market(ticker: str) -> dict:
+    """Returns the market info for a ticker, served from cache when available."""
+    market_info = _MARKET_INFO_CACHE.get(ticker)
+    if market_info is None:
+        market_info = market_identifier_tool.invoke(ticker)
+        _MARKET_INFO_CACHE.set(ticker, market_info)
+    return market_info
+
+
+def _prepare_context(ticker: str) -> dict:
+    """Builds the per-request context: market info plus the date window, from one clock read."""
+    market_info = _identify_market(ticker)
+    now = datetime.now()
+    today = now.strftime('%Y-%m-%d')
+    return {
+        "ticker": ticker,
+        "market_type": market_info.get("market_name", "Unknown"),
+        "market_info": market_info,
+        "start_date": (now - timedelta(days=365)).strftime('%Y-%m-%d'),
+        "end_date": today,
+        "curr_date": today,
+    }
+
+
+def _is_failed_section(section: str) -> bool:
+    return section.partition("\n")[2].startswith(FAILED_SECTION_PREFIX)
+
+
+def _has_a_share_data(sections: List[str]) -> bool:
+    """The A-share tool reports failures as sections; it has data unless every section failed."""
+    return any(not _is_failed_section(section) for section in sections)
+
+
+def _is_complete_report(report: str) -> bool:
+    """Only reports without failed sections are cached; a partial failure is retried next time."""
+    return is_valid_result(report) and f"\n{FAILED_SECTION_PREFIX}" not in report
+
+
+@lru_cache(maxsize=1)
+def _create_fetch_steps():
+    """
+    Builds the market identification step and the market router shared by the
+    report chain and the streaming report chain.
     """
 
     # Step 1: Market Identification and Context Setup
     # This initial step takes the input ticker, identifies the market,
-    # and prepares all necessary date parameters.
-    market_identification_step = RunnableLambda(
-        lambda ticker: {
-            "ticker": ticker,
-            "market_info": market_identifier_tool.invoke(ticker),
-            "start_date": (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d'),
-            "end_date": datetime.now().strftime('%Y-%m-%d'),
-            "curr_date": datetime.now().strftime('%Y-%m-%d')
-        }
-    ) | RunnableLambda(
-        lambda x: {
-            "ticker": x["ticker"],
-            "market_type": x["market_info"].get("market_name", "Unknown"),
-            "market_info": x["market_info"],
-            "start_date": x["start_date"],
-            "end_date": x["end_date"],
-            "curr_date": x["curr_date"]
-        }
-    )
+    # and prepares all necessary date parameters in a single step.
+    market_identification_step = RunnableLambda(_prepare_context)
 
     # Step 2: Define Market-Specific Data Fetching Chains with Fallbacks
-    a_share_combined_chain = get_a_share_fundamentals_optimized
+    # The A-share tool never raises; when both its fetches fail it raises NoDataError here,
+    # so the failure is reported once instead of being cached as a report.
+    a_share_combined_chain = require_result(
+        get_a_share_fundamentals_optimized,
+        lambda x: f"⚠️ A股 {x['ticker']} 数据获取失败。",
+        validator=_has_a_share_data,
+    )
     
-    # HK data chain: Tries Yahoo -> Finnhub -> AKShare -> Final failure message.
-    hk_data_chain = get_us_data_yahoo.with_fallbacks(
-        fallbacks=[
-            get_us_data_finnhub.with_fallbacks([
-                get_hk_data_akshare_wip.with_fallbacks([
-                    get_hk_data_yahoo_wip.with_fallbacks([
-                        get_hk_data_finnhub_wip.with_fallbacks([
-                            RunnableLambda(lambda x: f"⚠️ 港股 {x['ticker']} 数据获取失败。")
-                        ])
-                    ])
-                ])
+    # HK data chain: Yahoo and Finnhub race each other and the first valid report wins.
+    # Only if both fail or time out: AKShare -> Yahoo(HK) -> Finnhub(HK) -> NoDataError.
+    hk_data_chain = require_result(
+        create_race_runnable(
+            [get_us_data_yahoo, get_us_data_finnhub],
+            with_result_validation(get_hk_data_akshare_wip).with_fallbacks([
+                with_result_validation(get_hk_data_yahoo_wip),
+                get_hk_data_finnhub_wip,
             ])
-        ]
+        ),
+        lambda x: f"⚠️ 港股 {x['ticker']} 数据获取失败。"
     ) | RunnableLambda(lambda x: [f"## 🇭🇰 港股数据\n{x}"])
 
-    # US data chain: Tries Finnhub -> Yahoo -> OpenAI -> Final failure message.
-    us_data_chain = get_us_data_finnhub.with_fallbacks(
-        fallbacks=[
-            get_us_data_yahoo.with_fallbacks([
-                get_us_data_openai.with_fallbacks([
-                    RunnableLambda(lambda x: f"⚠️ 美股 {x['ticker']} 数据获取失败。")
-                ])
-            ])
-        ]
+    # US data chain: Finnhub and Yahoo race each other and the first valid report wins.
+    # Only if both fail or time out: OpenAI -> NoDataError.
+    us_data_chain = require_result(
+        create_race_runnable([get_us_data_finnhub, get_us_data_yahoo], get_us_data_openai),
+        lambda x: f"⚠️ 美股 {x['ticker']} 数据获取失败。"
     ) | RunnableLambda(lambda x: [f"## 🇺🇸 美股数据\n{x}"])
 
     # Step 3: Create the Router
-    # This branch directs the input to the correct market-specific chain.
-    router = RunnableBranch(
-        (lambda x: x["market_type"] == "中国A股", a_share_combined_chain),
-        (lambda x: x["market_type"] == "港股", hk_data_chain),
-        us_data_chain  # Default case for US stocks
+    # A dict lookup directs the input to the correct market-specific chain; the
+    # returned chain is then invoked by LCEL with the same input.
+    market_chains = {
+        "中国A股": a_share_combined_chain,
+        "港股": hk_data_chain,
+    }
+    router = RunnableLambda(
+        lambda x: market_chains.get(x["market_type"], us_data_chain)  # Default case for US stocks
     )
 
+    return market_identification_step, router
+
+
+def _report_no_data(chain):
+    """
+    Turns a NoDataError from `chain` into its user-facing message.
+
+    Applied outside the result cache so that the failure message is reported once
+    and never cached as if it were a report.
+    """
+    def _invoke(ticker, config):
+        try:
+            return chain.invoke(ticker, config)
+        except NoDataError as e:
+            logger.warning(f"No fundamentals data for {ticker}: {e}")
+            return str(e)
+
+    async def _ainvoke(ticker, config):
+        try:
+            return await chain.ainvoke(ticker, config)
+        except NoDataError as e:
+            logger.warning(f"No fundamentals data for {ticker}: {e}")
+            return str(e)
+
+    return RunnableLambda(_invoke, afunc=_ainvoke, name="fundamentals_data_chain_report")
+
+
+def _assign_results(router):
+    """
+    Adds the router's output to the context as `results`.
+
+    Equivalent to `RunnablePassthrough.assign(results=router)` but a single dict merge,
+    without the per-request parallel step that `assign` runs for one key.
+    """
+    def _assign(x, config):
+        return {**x, "results": router.invoke(x, config)}
+
+    async def _aassign(x, config):
+        return {**x, "results": await router.ainvoke(x, config)}
+
+    return RunnableLambda(_assign, afunc=_aassign)
+
+
+@lru_cache(maxsize=1)
+def create_fundamentals_data_chain():
+    """
+    Creates an integrated LCEL chain for fetching fundamental data,
+    handling different markets and fallbacks automatically.
+
+    The chain takes a ticker string as input and returns a formatted report string.
+    The chain is stateless, so it is built once and the same instance is returned
+    on every subsequent call.
+    """
+    market_identification_step, router = _create_fetch_steps()
+
     # Step 4: Assemble the Final Chain
     # The final chain pipes all steps together:
     # 1. Identify market.
@@ -83,7 +178,7 @@ def create_fundamentals_data_chain():
     # 3. Format the final report.
     final_chain = (
         market_identification_step
-        | RunnablePassthrough.assign(results=router)
+        | _assign_results(router)
         | RunnableLambda(
             lambda x: format_fundamentals_report.invoke({
                 "ticker": x["ticker"],
@@ -94,7 +189,95 @@ def create_fundamentals_data_chain():
         )
     )
 
-    return final_chain
+    # Build the Pydantic input/output schemas now, while the (memoized) factory runs
+    # once per process, instead of lazily on the first request.
+    final_chain.get_input_schema()
+    final_chain.get_output_schema()
+
+    # Step 5: Cache the report per (ticker, curr_date) so that several analysts
+    # asking for the same ticker on the same day share one upstream fetch.
+    # A market with no data raises NoDataError, which bypasses the cache and is
+    # turned into the failure message at the top level; a report with a failed
+    # section is returned but not cached.
+    return _report_no_data(with_result_cache(
+        final_chain,
+        key_fn=lambda ticker: (ticker.strip().upper(), datetime.now().strftime('%Y-%m-%d')),
+        name="fundamentals_data_chain",
+        validator=_is_complete_report,
+    ))
+
+
+@lru_cache(maxsize=1)
+def create_fundamentals_stream_chain():
+    """
+    Creates a streaming variant of the fundamentals chain.
+
+    `astream(ticker)` yields the report header as soon as the market is identified and
+    the data sections once the market-specific chain resolves, so a downstream LLM can
+    start consuming the report while the upstream fetch is still running.
+    `stream(ticker)` does the same synchronously, and `invoke(ticker)` / `ainvoke(ticker)`
+    join the chunks and return the same string as the report chain.
+    """
+    market_identification_step, router = _create_fetch_steps()
+
+    def _results(context: dict) -> List[str]:
+        try:
+            return router.invoke(context)
+        except NoDataError as e:
+            # The header has already been streamed, so report the failure as the data section.
+            return [str(e)]
+
+    async def _aresults(context: dict) -> List[str]:
+        try:
+            return await router.ainvoke(context)
+        except NoDataError as e:
+            # The header has already been streamed, so report the failure as the data section.
+            return [str(e)]
+
+    async def _astream_report(tickers: AsyncIterator[str]) -> AsyncIterator[str]:
+        async for ticker in tickers:
+            context = await market_identification_step.ainvoke(ticker)
+            async for chunk in aiter_fundamentals_report(
+                context["ticker"], context["market_info"], context["curr_date"], _aresults(context)
+            ):
+                yield chunk
+
+    def _stream_report(tickers: Iterator[str]) -> Iterator[str]:
+        for ticker in tickers:
+            context = market_identification_step.invoke(ticker)
+            yield from iter_fundamentals_report(
+                context["ticker"], context["market_info"], context["curr_date"], lambda: _results(context)
+            )
+
+    return RunnableGenerator(_stream_report, _astream_report, name="fundamentals_report_stream")
+
+
+def create_fundamentals_batch_chain(max_concurrency: int = 8):
+    """
+    Creates a chain that fetches fundamentals reports for several tickers in one call.
+
+    The chain takes a list of ticker strings and returns a dict mapping each ticker to
+    its formatted report. Duplicate tickers are fetched once, and the per-ticker chains
+    run concurrently since the work is dominated by upstream HTTP calls.
+    """
+    single_chain = create_fundamentals_data_chain()
+
+    async def _afetch_all(tickers: List[str]) -> Dict[str, str]:
+        unique_tickers = list(dict.fromkeys(t.strip() for t in tickers if t and t.strip()))
+        reports = await single_chain.abatch(
+            unique_tickers,
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        )
+        return {
+            ticker: f"⚠️ {ticker} 基本面数据获取失败: {report}" if isinstance(report, Exception) else report
+            for ticker, report in zip(unique_tickers, reports)
+        }
+
+    return RunnableLambda(
+        lambda tickers: run_coroutine_sync(_afetch_all(tickers)),
+        afunc=_afetch_all,
+    )
 
 # Example of how to create and use the chain:
 # if __name__ == '__main__':
@@ -116,3 +299,9 @@ def create_fundamentals_data_chain():
 #     print("\n--- Testing US Stock ---")
 #     us_stock_report = fundamentals_chain.invoke("AAPL")
 #     print(us_stock_report)
+
+#     # Test several tickers at once
+#     print("\n--- Testing Batch ---")
+#     batch_reports = create_fundamentals_batch_chain().invoke(["600519", "0700.HK", "AAPL"])
+#     for ticker, report in batch_reports.items():
+#         print(ticker, report[:200])
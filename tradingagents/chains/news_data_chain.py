@@ -4,7 +4,10 @@ This module creates the LangChain Expression Language (LCEL) chain for fetching
 It abstracts the logic of routing and fallbacks into a single, composable chain.
 """
 import re
-from langchain_core.runnables import RunnableBranch, RunnablePassthrough
+import threading
+from functools import lru_cache
+from langchain_core.runnables import RunnableLambda
+from tradingagents.chains._race import with_result_validation
 from tradingagents.tools.news_lcel_tools import (
     realtime_news_tool,
     google_news_tool,
@@ -12,20 +15,38 @@ from tradingagents.tools.news_lcel_tools import (
     finnhub_news_tool
 )
 
+# Stock code patterns, compiled once at import time.
+_A_SHARE_NUM = re.compile(r'^(00|30|60|68)\d{4}$')
+_A_SHARE_PREFIX = re.compile(r'^(SZ|SH)\d{6}$')
+_HK_DOT = re.compile(r'^\d{4,5}\.HK$')
+_HK_PLAIN = re.compile(r'^\d{4,5}$')
+
+@lru_cache(maxsize=4096)
 def _identify_stock_type(stock_code: str) -> str:
     """Identifies the stock type (A-share, HK, US) from its code."""
     stock_code = stock_code.upper().strip()
 
     # A-share patterns
-    if re.match(r'^(00|30|60|68)\d{4}$', stock_code) or re.match(r'^(SZ|SH)\d{6}$', stock_code):
+    if _A_SHARE_NUM.match(stock_code) or _A_SHARE_PREFIX.match(stock_code):
         return "A-share"
     # HK-share patterns
-    elif re.match(r'^\d{4,5}\.HK$', stock_code) or (re.match(r'^\d{4,5}$', stock_code) and len(stock_code) <= 5):
+    elif _HK_DOT.match(stock_code) or _HK_PLAIN.match(stock_code):
         return "HK-share"
     # US-share patterns (default)
     else:
         return "US-share"
 
+# Defaults for the optional chain parameters; caller-supplied values take precedence.
+_DEFAULTS = {"hours_back": 6, "look_back_days": 7}
+
+def _prepare_input(x: dict) -> dict:
+    """Fills in the optional parameters and the market type with a single dict merge."""
+    return {**_DEFAULTS, **x, "market_type": _identify_stock_type(x["ticker"])}
+
+# `lru_cache` does not stop two threads from building the chain concurrently on first
+# use, which would leave callers holding separately built (and separately warmed) chains.
+_CHAIN_BUILD_LOCK = threading.Lock()
+
 def create_news_data_chain():
     """
     Creates an integrated LCEL chain for fetching news, handling different
@@ -33,43 +54,67 @@ def create_news_data_chain():
 
     The chain takes a dictionary which must contain a "ticker" key, and can
     optionally contain "hours_back" and "look_back_days". It returns a
-    string containing the fetched news.
+    string containing the fetched news. The chain is stateless, so it is
+    built once and the same instance is returned on every subsequent call.
     """
+    with _CHAIN_BUILD_LOCK:
+        return _build_news_data_chain()
+
+@lru_cache(maxsize=1)
+def _build_news_data_chain():
     # Step 1: Define Market-Specific Data Fetching Chains
+    # `with_fallbacks` only advances on exceptions, so every provider but the last
+    # raises EmptyResultError on an empty or failure result to hand over to the next one.
+    realtime_news = with_result_validation(realtime_news_tool)
+    google_news = with_result_validation(google_news_tool)
+    global_news_openai = with_result_validation(global_news_openai_tool)
+
     # For A-shares: Priority is Realtime -> Google -> OpenAI Global
-    a_share_chain = realtime_news_tool.with_fallbacks(
-        fallbacks=[google_news_tool, global_news_openai_tool]
+    a_share_chain = realtime_news.with_fallbacks(
+        fallbacks=[google_news, global_news_openai_tool]
     )
 
     # For HK-shares: Priority is Google -> OpenAI Global -> Realtime
-    hk_share_chain = google_news_tool.with_fallbacks(
-        fallbacks=[global_news_openai_tool, realtime_news_tool]
+    hk_share_chain = google_news.with_fallbacks(
+        fallbacks=[global_news_openai, realtime_news_tool]
     )
 
     # For US-shares: Priority is OpenAI Global -> Google -> Finnhub
-    us_share_chain = global_news_openai_tool.with_fallbacks(
-        fallbacks=[google_news_tool, finnhub_news_tool]
+    us_share_chain = global_news_openai.with_fallbacks(
+        fallbacks=[google_news, finnhub_news_tool]
     )
 
     # Step 2: Create the Router
-    # This branch directs the input to the correct market-specific chain.
-    news_router = RunnableBranch(
-        (lambda x: _identify_stock_type(x['ticker']) == "A-share", a_share_chain),
-        (lambda x: _identify_stock_type(x['ticker']) == "HK-share", hk_share_chain),
-        us_share_chain,  # Default case for US shares
-    )
+    # The market type is identified once per request, and the input is handed straight
+    # to the market-specific chain. Preparing the input and dispatching in one step
+    # avoids a separate selector node in the sequence that returns the chain for LCEL
+    # to invoke afterwards.
+    market_chains = {
+        "A-share": a_share_chain,
+        "HK-share": hk_share_chain,
+        "US-share": us_share_chain,
+    }
 
-    # Step 3: Prepare the Input
-    # This runnable ensures that default values for optional parameters are set.
-    # It takes the input dictionary, adds defaults if keys are missing, and
-    # passes the completed dictionary to the router. LangChain automatically
-    # maps the dictionary keys to the arguments of the invoked tool.
-    prepare_input = RunnablePassthrough.assign(
-        hours_back=lambda x: x.get("hours_back", 6),
-        look_back_days=lambda x: x.get("look_back_days", 7)
-    )
+    # Step 3: Prepare the Input and Dispatch
+    # Default values for optional parameters are filled in before the market chain
+    # runs; LangChain automatically maps the dictionary keys to the arguments of the
+    # invoked tool.
+    def _route(x, config):
+        prepared = _prepare_input(x)
+        return market_chains[prepared["market_type"]].invoke(prepared, config)
+
+    async def _aroute(x, config):
+        prepared = _prepare_input(x)
+        return await market_chains[prepared["market_type"]].ainvoke(prepared, config)
 
     # Step 4: Assemble the Final Chain
-    final_chain = prepare_input | news_router
+    final_chain = RunnableLambda(_route, afunc=_aroute, name="news_router")
+
+    # Build the Pydantic input/output schemas now, while the (memoized) factory runs
+    # once per process, instead of lazily on the first request.
+    final_chain.get_input_schema()
+    final_chain.get_output_schema()
 
+    # The chain itself is uncached: the unified news tool caches finished reports per
+    # ticker and is the only layer that decides how long news stays fresh.
     return final_chain
@@ -1,9 +1,8 @@
 
 import pandas as pd
 import logging
-from typing import Dict
 from tradingagents.dataflows import akshare_utils
-from tradingagents.utils.enhanced_news_filter import EnhancedNewsFilter, create_enhanced_news_filter
+from tradingagents.utils.enhanced_news_filter import EnhancedNewsFilter, get_cached_enhanced_news_filter
 
 logger = logging.getLogger(__name__)
 
@@ -20,22 +19,17 @@ class NewsProcessingPipeline:
                               默认为 akshare_utils.get_stock_news_em。
         """
         self._fetcher = fetcher_function
-        self._filter_cache: Dict[str, EnhancedNewsFilter] = {}
 
     def _get_filter(self, symbol: str, **kwargs) -> EnhancedNewsFilter:
         """
         为指定的股票代码获取或创建一个过滤器实例。
-        使用缓存避免重复加载模型。
+        使用进程内共享的有界 LRU 缓存，避免重复加载模型且内存占用不随股票数量增长。
         """
-        cache_key = f"{symbol}-{kwargs.get('use_semantic', True)}-{kwargs.get('use_local_model', False)}"
-        if cache_key not in self._filter_cache:
-            logger.info(f"为 {symbol} 创建新的新闻过滤器实例...")
-            self._filter_cache[cache_key] = create_enhanced_news_filter(
-                ticker=symbol,
-                use_semantic=kwargs.get('use_semantic', True),
-                use_local_model=kwargs.get('use_local_model', False)
-            )
-        return self._filter_cache[cache_key]
+        return get_cached_enhanced_news_filter(
+            symbol,
+            kwargs.get('use_semantic', True),
+            kwargs.get('use_local_model', False)
+        )
 
     def run(
         self,
@@ -12,11 +12,12 @@ import logging
 from typing import Dict, Any
 
 from langchain_core.runnables import RunnableSerializable, RunnableConfig, RunnableLambda
-from pydantic.v1 import BaseModel, Field
+from pydantic import BaseModel, Field
 
 from tradingagents.dataflows import akshare_utils
-from tradingagents.utils.enhanced_news_filter import EnhancedNewsFilter, create_enhanced_news_filter
+from tradingagents.utils.enhanced_news_filter import EnhancedNewsFilter, get_cached_enhanced_news_filter
 from tradingagents.utils.news_filter import create_news_filter
+from tradingagents.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -34,41 +35,58 @@ class NewsFilterInput(BaseModel):
 
 # Block 1: The News Fetcher
 # Takes an input dictionary and adds the raw news DataFrame to it.
-fetcher_runnable = RunnableLambda(
-    lambda x: {
-        **x,
-        "raw_news_df": akshare_utils.get_stock_news_em(x['symbol'], max_news=x['max_news'])
-    },
-    name="NewsFetcher"
-)
+# Eastmoney news changes on the order of minutes and the scrape is slow and rate-limited,
+# so responses are reused for 60 seconds per (symbol, max_news).
+_NEWS_CACHE = TTLCache(maxsize=512, ttl=60)
+
+def _fetch_news(symbol: str, max_news: int) -> pd.DataFrame:
+    key = (symbol, max_news)
+    news_df = _NEWS_CACHE.get(key)
+    if news_df is None:
+        news_df = akshare_utils.get_stock_news_em(symbol, max_news=max_news)
+        if not news_df.empty:
+            _NEWS_CACHE.set(key, news_df)
+    return news_df
+
+def _fetch(x: Dict[str, Any]) -> Dict[str, Any]:
+    return {**x, "raw_news_df": _fetch_news(x['symbol'], x['max_news'])}
+
+async def _afetch(x: Dict[str, Any]) -> Dict[str, Any]:
+    # The akshare fetch is blocking HTTP; run it on a worker thread so that
+    # concurrent requests (e.g. `abatch` over several symbols) overlap.
+    df = await asyncio.to_thread(_fetch_news, x['symbol'], x['max_news'])
+    return {**x, "raw_news_df": df}
+
+fetcher_runnable = RunnableLambda(_fetch, afunc=_afetch, name="NewsFetcher")
 
 # Block 2: The Simple Filter (NewsRelevanceFilter)
 # Takes the output from the fetcher and applies the simple filter.
-simple_filter_runnable = RunnableLambda(
-    lambda x: create_news_filter(x['symbol']).filter_news(
-        x['raw_news_df'], min_score=x['min_score']
-    ) if not x['raw_news_df'].empty else pd.DataFrame(),
-    name="SimpleRelevanceFilter"
-)
+# Returned for "no news" instead of allocating a new empty DataFrame on every call.
+_EMPTY_NEWS_DF = pd.DataFrame()
+
+def _simple_filter(x: Dict[str, Any]) -> pd.DataFrame:
+    news_df = x['raw_news_df']
+    # Skip building the filter entirely when the fetcher returned nothing.
+    if len(news_df.index) == 0:
+        return _EMPTY_NEWS_DF
+    return create_news_filter(x['symbol']).filter_news(news_df, min_score=x['min_score'])
+
+simple_filter_runnable = RunnableLambda(_simple_filter, name="SimpleRelevanceFilter")
 
 # Block 3: The Enhanced Filter (Stateful Runnable)
 class EnhancedNewsFilterRunnable(RunnableSerializable):
-    """A stateful Runnable to cache and apply the EnhancedNewsFilter."""
-    _filter_cache: Dict[str, EnhancedNewsFilter] = {}
+    """A Runnable that applies the EnhancedNewsFilter, reusing filters from a shared bounded LRU cache."""
 
     def _get_filter(self, config: Dict[str, Any]) -> EnhancedNewsFilter:
-        symbol = config['symbol']
-        use_semantic = config.get('use_semantic', True)
-        use_local_model = config.get('use_local_model', True)
-        cache_key = f"{symbol}-enhanced-{use_semantic}-{use_local_model}"
-        if cache_key not in self._filter_cache:
-            logger.info(f"Creating new EnhancedNewsFilter for {symbol}")
-            self._filter_cache[cache_key] = create_enhanced_news_filter(ticker=symbol, use_semantic=use_semantic, use_local_model=use_local_model)
-        return self._filter_cache[cache_key]
+        return get_cached_enhanced_news_filter(
+            config['symbol'],
+            config.get('use_semantic', True),
+            config.get('use_local_model', True),
+        )
 
     def invoke(self, input: Dict[str, Any], config: RunnableConfig | None = None) -> pd.DataFrame:
         news_df = input['raw_news_df']
-        if news_df.empty:
+        if len(news_df.index) == 0:
             return news_df
         filter_instance = self._get_filter(input)
         return filter_instance.filter(news_df, min_score=input['min_score'])
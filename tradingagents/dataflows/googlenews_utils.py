@@ -8,10 +8,11 @@ from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
     retry_if_result,
 )
 
+from tradingagents.dataflows.http_client import get_shared_requests_session
+
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
@@ -22,17 +23,19 @@ def is_rate_limited(response):
     return response.status_code == 429
 
 
+# 连接失败由共享 Session 的 urllib3 重试策略处理，这里只对限流 (429) 退避重试，
+# 避免两层重试叠加成数十次连接尝试
 @retry(
-    retry=(retry_if_result(is_rate_limited) | retry_if_exception_type(requests.exceptions.ConnectionError) | retry_if_exception_type(requests.exceptions.Timeout)),
+    retry=retry_if_result(is_rate_limited),
     wait=wait_exponential(multiplier=1, min=4, max=60),
     stop=stop_after_attempt(5),
 )
 def make_request(url, headers):
-    """Make a request with retry logic for rate limiting and connection issues"""
+    """Make a request with retry logic for rate limiting; connection retries happen in the shared session"""
     # Random delay before each request to avoid detection
     time.sleep(random.uniform(2, 6))
     # 添加超时参数，设置连接超时和读取超时
-    response = requests.get(url, headers=headers, timeout=(10, 30))  # 连接超时10秒，读取超时30秒
+    response = get_shared_requests_session().get(url, headers=headers, timeout=(10, 30))  # 连接超时10秒，读取超时30秒
     return response
 
 
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+共享HTTP客户端
+为新闻/基本面数据源复用同一个带连接池的 httpx 客户端（以及基于 requests 的数据源使用的共享 Session），
+避免每次调用都重新进行 TCP+TLS 握手
+"""
+
+import atexit
+from functools import lru_cache
+
+import httpx
+import requests
+from openai import OpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+# 连接池大小需要覆盖并发竞速 (race) 时同时发出的请求数
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+# OpenAI web search 响应较慢，读取超时需要足够宽松；连接超时保持较短以便快速失败
+_TIMEOUT = httpx.Timeout(120.0, connect=3.0)
+# requests 连接池：每个主机最多保留的连接数需覆盖新闻批量/竞速并发
+_REQUESTS_POOL_CONNECTIONS = 32
+_REQUESTS_POOL_MAXSIZE = 64
+# 仅对连接失败和网关类错误做少量快速重试；429 等限流由调用方自行处理
+_REQUESTS_RETRY = Retry(
+    total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=("GET",), raise_on_status=False
+)
+
+
+@lru_cache(maxsize=1)
+def get_shared_http_client() -> httpx.Client:
+    """
+    获取进程内共享的 httpx 同步客户端
+
+    Returns:
+        httpx.Client: 带连接池和 keep-alive 的客户端
+    """
+    logger.debug("🌐 [HTTP] 创建共享 httpx 客户端")
+    client = httpx.Client(limits=_LIMITS, timeout=_TIMEOUT)
+    atexit.register(client.close)
+    return client
+
+
+@lru_cache(maxsize=8)
+def get_openai_client(base_url: str) -> OpenAI:
+    """
+    获取指定 backend_url 的共享 OpenAI 客户端
+
+    Args:
+        base_url: OpenAI 兼容 API 地址
+
+    Returns:
+        OpenAI: 复用共享连接池的 OpenAI 客户端
+    """
+    return OpenAI(base_url=base_url, http_client=get_shared_http_client())
+
+
+@lru_cache(maxsize=1)
+def get_shared_requests_session() -> requests.Session:
+    """
+    获取进程内共享的 requests Session
+
+    供仍基于 requests 的新闻数据源（Google News、实时新闻聚合器等）复用 keep-alive 连接池
+
+    Returns:
+        requests.Session: 挂载了连接池和重试策略的 Session
+    """
+    logger.debug("🌐 [HTTP] 创建共享 requests Session")
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=_REQUESTS_POOL_CONNECTIONS,
+        pool_maxsize=_REQUESTS_POOL_MAXSIZE,
+        max_retries=_REQUESTS_RETRY,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    atexit.register(session.close)
+    return session
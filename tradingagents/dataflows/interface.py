@@ -52,6 +52,7 @@ import os
 import pandas as pd
 from tqdm import tqdm
 from openai import OpenAI
+from .http_client import get_openai_client
 
 # 尝试导入yfinance，如果失败则设置为None
 try:
@@ -786,7 +787,7 @@ def get_YFin_data(
 
 def get_stock_news_openai(ticker, curr_date):
     config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    client = get_openai_client(config["backend_url"])
 
     response = client.responses.create(
         model=config["quick_think_llm"],
@@ -821,7 +822,7 @@ def get_stock_news_openai(ticker, curr_date):
 
 def get_global_news_openai(curr_date):
     config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    client = get_openai_client(config["backend_url"])
 
     response = client.responses.create(
         model=config["quick_think_llm"],
@@ -1032,7 +1033,7 @@ def get_fundamentals_openai(ticker, curr_date):
 
         logger.debug(f"📊 [DEBUG] 尝试使用OpenAI获取 {ticker} 的基本面数据...")
 
-        client = OpenAI(base_url=config["backend_url"])
+        client = get_openai_client(config["backend_url"])
 
         response = client.responses.create(
             model=config["quick_think_llm"],
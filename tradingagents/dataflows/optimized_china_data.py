@@ -186,8 +186,14 @@ class OptimizedChinaDataProvider:
             logger.error(f"❌ {error_msg}")
             return self._generate_fallback_fundamentals(symbol, error_msg)
     
-    def _generate_fundamentals_report(self, symbol: str, stock_data: str) -> str:
-        """基于股票数据生成真实的基本面分析报告"""
+    def _generate_fundamentals_report(self, symbol: str, stock_data: str, stock_info: Optional[str] = None) -> str:
+        """基于股票数据生成真实的基本面分析报告
+
+        Args:
+            symbol: 股票代码
+            stock_data: 股票价格数据
+            stock_info: 预先获取的股票基本信息，为 None 时在此处获取
+        """
 
         # 添加详细的股票代码追踪日志
         logger.debug(f"🔍 [股票代码追踪] _generate_fundamentals_report 接收到的股票代码: '{symbol}' (类型: {type(symbol)})")
@@ -204,8 +210,9 @@ class OptimizedChinaDataProvider:
         # 首先尝试从统一接口获取股票基本信息
         try:
             logger.debug(f"🔍 [股票代码追踪] 尝试获取{symbol}的基本信息...")
-            from .interface import get_china_stock_info_unified
-            stock_info = get_china_stock_info_unified(symbol)
+            if stock_info is None:
+                from .interface import get_china_stock_info_unified
+                stock_info = get_china_stock_info_unified(symbol)
             logger.debug(f"🔍 [股票代码追踪] 获取到的股票信息: {stock_info}")
 
             if "股票名称:" in stock_info:
@@ -7,16 +7,29 @@
 import requests
 import json
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict, Optional
 import time
 import os
 from dataclasses import dataclass
 
+from tradingagents.dataflows.http_client import get_shared_requests_session
+
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
 
 
+@lru_cache(maxsize=4)
+def _format_timestamp(epoch_second: int) -> str:
+    """按秒缓存的时间戳格式化，同一秒内生成的报告复用同一个字符串"""
+    return datetime.fromtimestamp(epoch_second).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _now_timestamp() -> str:
+    """当前时间（精确到秒）的报告时间戳"""
+    return _format_timestamp(int(time.time()))
+
 
 @dataclass
 class NewsItem:
@@ -34,6 +47,8 @@ class RealtimeNewsAggregator:
     """实时新闻聚合器"""
 
     def __init__(self):
+        # 共享连接池，避免每次请求都重新握手
+        self.session = get_shared_requests_session()
         self.headers = {
             'User-Agent': 'TradingAgents-CN/1.0'
         }
@@ -159,7 +174,7 @@ class RealtimeNewsAggregator:
                 'token': self.finnhub_key
             }
 
-            response = requests.get(url, params=params, headers=self.headers)
+            response = self.session.get(url, params=params, headers=self.headers)
             response.raise_for_status()
 
             news_data = response.json()
@@ -204,7 +219,7 @@ class RealtimeNewsAggregator:
                 'limit': 50
             }
 
-            response = requests.get(url, params=params, headers=self.headers)
+            response = self.session.get(url, params=params, headers=self.headers)
             response.raise_for_status()
 
             data = response.json()
@@ -264,7 +279,7 @@ class RealtimeNewsAggregator:
                 'apiKey': self.newsapi_key
             }
 
-            response = requests.get(url, params=params, headers=self.headers)
+            response = self.session.get(url, params=params, headers=self.headers)
             response.raise_for_status()
 
             data = response.json()
@@ -629,7 +644,7 @@ class RealtimeNewsAggregator:
         logger.info(f"[新闻报告] {ticker} 新闻来源分布: {sources_info}")
 
         report = f"# {ticker} 实时新闻分析报告\n\n"
-        report += f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        report += f"生成时间: {_now_timestamp()}\n"
         report += f"新闻总数: {len(news_items)}条\n\n"
 
         if high_urgency:
@@ -769,7 +784,7 @@ def get_realtime_stock_news(ticker: str, curr_date: str, hours_back: int = 6) ->
                 logger.info(f"[新闻分析] 成功获取 {news_count} 条东方财富新闻，耗时 {time_taken:.2f} 秒")
 
                 report = f"# {ticker} 东方财富新闻报告\n\n"
-                report += f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                report += f"生成时间: {_now_timestamp()}\n"
                 report += f"新闻总数: {news_count}条\n"
                 report += f"获取耗时: {time_taken:.2f}秒\n\n"
 
@@ -870,7 +885,7 @@ def get_realtime_stock_news(ticker: str, curr_date: str, hours_back: int = 6) ->
                 logger.info(f"[新闻分析] 成功获取 {news_count} 条东方财富港股新闻，耗时 {time_taken:.2f} 秒")
 
                 report = f"# {ticker} 东方财富新闻报告\n\n"
-                report += f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                report += f"生成时间: {_now_timestamp()}\n"
                 report += f"新闻总数: {news_count}条\n"
                 report += f"获取耗时: {time_taken:.2f}秒\n\n"
 
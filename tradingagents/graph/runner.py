@@ -0,0 +1,76 @@
+# TradingAgents/graph/runner.py
+
+import asyncio
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Sequence
+
+from .trading_graph import TradingAgentsGraph
+
+DEFAULT_ANALYSTS = ("market", "social", "news", "fundamentals")
+
+
+@lru_cache(maxsize=4)
+def _build_graph(config_key: tuple, analysts: tuple, worker_id: int) -> TradingAgentsGraph:
+    return TradingAgentsGraph(
+        selected_analysts=list(analysts),
+        debug=True,
+        config=dict(config_key),
+    )
+
+
+def get_graph(
+    config: Dict[str, Any], analysts: Sequence[str] = DEFAULT_ANALYSTS, *, worker_id: int = 0
+) -> TradingAgentsGraph:
+    """
+    Returns the graph for a config, analysts and worker, building it once.
+
+    The cache key is always built here, so every caller (analysis, warmup,
+    reflection) gets the same instance for the same config, analysts and worker.
+    """
+    return _build_graph(tuple(sorted(config.items())), tuple(analysts), worker_id)
+
+
+def analyze(
+    ticker: str,
+    config: Dict[str, Any],
+    analysts: Sequence[str] = DEFAULT_ANALYSTS,
+    trade_date: str = None,
+    worker_id: int = 0,
+):
+    """Runs the full analysis for one ticker and returns the processed decision."""
+    ta = get_graph(config, analysts, worker_id=worker_id)
+    _, decision = ta.propagate(ticker, trade_date=trade_date or date.today().strftime("%Y-%m-%d"))
+    return decision
+
+
+async def analyze_batch(
+    tickers: list,
+    config: Dict[str, Any],
+    analysts: Sequence[str] = DEFAULT_ANALYSTS,
+    trade_date: str = None,
+    max_concurrency: int = 2,
+) -> dict:
+    """
+    Analyzes several tickers concurrently.
+
+    propagate() keeps per-run state on the graph (ticker, curr_state, state log), so
+    each concurrent worker gets its own cached graph instead of sharing one.
+    """
+    queue = asyncio.Queue()
+    for ticker in tickers:
+        queue.put_nowait(ticker)
+    decisions = {}
+
+    async def worker(worker_id: int):
+        while not queue.empty():
+            ticker = queue.get_nowait()
+            try:
+                decisions[ticker] = await asyncio.to_thread(
+                    analyze, ticker, config, analysts, trade_date, worker_id
+                )
+            except Exception as e:
+                decisions[ticker] = e
+
+    await asyncio.gather(*(worker(i) for i in range(min(max_concurrency, len(tickers)))))
+    return decisions
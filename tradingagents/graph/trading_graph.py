@@ -334,6 +334,35 @@ class TradingAgentsGraph:
             ),
         }
 
+    def _warmup(self):
+        """预热 LLM 连接和数据链，把首个真实请求的握手和初始化开销提前到启动阶段
+
+        适合在后台线程中调用；任何预热失败都只记录日志，不影响正常分析。
+        """
+        from tradingagents.chains.fundamentals_data_chain import create_fundamentals_data_chain
+        from tradingagents.chains.news_data_chain import create_news_data_chain
+
+        # 链工厂带缓存，提前构建后首个请求直接复用链和已生成的输入/输出 schema
+        for factory in (create_fundamentals_data_chain, create_news_data_chain):
+            try:
+                factory()
+            except Exception as e:
+                logger.warning(f"⚠️ [预热] 构建 {factory.__name__} 失败: {e}")
+
+        # 关闭 LLM 缓存发起一次极短的请求，建立 TCP+TLS 连接并完成鉴权；
+        # 输出限制为 1 个 token，预热只为建立连接，不需要完整回复
+        for name, llm in (("deep", self.deep_thinking_llm), ("quick", self.quick_thinking_llm)):
+            try:
+                update = {"cache": False}
+                for field in ("max_tokens", "max_output_tokens"):
+                    if field in type(llm).model_fields:
+                        update[field] = 1
+                        break
+                llm.model_copy(update=update).invoke("ok")
+                logger.info(f"🔥 [预热] {name} LLM 连接已就绪")
+            except Exception as e:
+                logger.warning(f"⚠️ [预热] {name} LLM 预热失败: {e}")
+
     def propagate(self, company_name, trade_date):
         """Run the trading agents graph for a company on a specific date."""
 
@@ -1,16 +1,36 @@
 # tradingagents/tools/fundamentals_atomic_tools.py
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from langchain_core.tools import tool
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, Iterator
 import logging
 
+logger = logging.getLogger(__name__)
+
+# Body of a report section whose fetch failed; the chain uses it to recognise
+# sections that must not be cached or reported as data.
+FAILED_SECTION_PREFIX = "获取失败: "
+
+
+@lru_cache(maxsize=None)
+def _resolve(path: str) -> Any:
+    """
+    Lazily imports and returns the object at the dotted `path`.
+
+    The data provider modules are heavy, so they are still imported on first use,
+    but the resolved symbol is memoized instead of re-imported on every tool call.
+    """
+    module_name, _, name = path.rpartition('.')
+    return getattr(importlib.import_module(module_name), name)
+
 # 1. Market Identification Tool
 @tool
 def market_identifier_tool(ticker: str) -> dict:
     """
     Identifies the market type (A-share, HK, US) and basic information for a given stock ticker.
     """
-    from tradingagents.utils.stock_utils import StockUtils
-    return StockUtils.get_market_info(ticker)
+    return _resolve("tradingagents.utils.stock_utils.StockUtils").get_market_info(ticker)
 
 # 2. A-Share Data Source Tools
 @tool
@@ -18,34 +38,52 @@ def get_a_share_fundamentals_optimized(ticker: str, start_date: str, end_date: s
     """
     Generates a fundamentals report for an A-share stock using OptimizedChinaDataProvider. Primary source.
     """
-    logger = logging.getLogger(__name__)
     result_data = []
 
-    logger.info(f"🇨🇳 [统一基本面工具] 处理A股数据...")
-    logger.info(f"🔍 [股票代码追踪] 进入A股处理分支，ticker: '{ticker}'")
+    logger.info("🇨🇳 [统一基本面工具] 处理A股数据...")
+    logger.info("🔍 [股票代码追踪] 进入A股处理分支，ticker: '%s'", ticker)
+
+    get_china_stock_data_unified = _resolve("tradingagents.dataflows.interface.get_china_stock_data_unified")
+    get_china_stock_info_unified = _resolve("tradingagents.dataflows.interface.get_china_stock_info_unified")
+
+    # 价格数据和股票基本信息来自不同接口且互不依赖，并发获取；
+    # 基本面报告需要解析价格数据，因此仍在两者都返回后生成。
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        logger.info("🔍 [股票代码追踪] 调用 get_china_stock_data_unified，传入参数: ticker='%s', start_date='%s', end_date='%s'",
+                    ticker, start_date, end_date)
+        stock_data_future = executor.submit(get_china_stock_data_unified, ticker, start_date, end_date)
+        stock_info_future = executor.submit(get_china_stock_info_unified, ticker)
+
+    try:
+        stock_info = stock_info_future.result()
+    except Exception as e:
+        logger.warning("⚠️ 获取股票基本信息失败: %s", e)
+        stock_info = ""
 
     try:
         # 获取股票价格数据
-        from tradingagents.dataflows.interface import get_china_stock_data_unified
-        logger.info(f"🔍 [股票代码追踪] 调用 get_china_stock_data_unified，传入参数: ticker='{ticker}', start_date='{start_date}', end_date='{end_date}'")
-        stock_data = get_china_stock_data_unified(ticker, start_date, end_date)
-        logger.info(f"🔍 [股票代码追踪] get_china_stock_data_unified 返回结果前200字符: {stock_data[:200] if stock_data else 'None'}")
+        stock_data = stock_data_future.result()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🔍 [股票代码追踪] get_china_stock_data_unified 返回结果前200字符: %s",
+                        stock_data[:200] if stock_data else 'None')
         result_data.append(f"## A股价格数据\n{stock_data}")
     except Exception as e:
-        logger.error(f"🔍 [股票代码追踪] get_china_stock_data_unified 调用失败: {e}")
-        result_data.append(f"## A股价格数据\n获取失败: {e}")
+        logger.error("🔍 [股票代码追踪] get_china_stock_data_unified 调用失败: %s", e)
+        result_data.append(f"## A股价格数据\n{FAILED_SECTION_PREFIX}{e}")
 
     try:
         # 获取基本面数据
-        from tradingagents.dataflows.optimized_china_data import OptimizedChinaDataProvider
-        analyzer = OptimizedChinaDataProvider()
-        logger.info(f"🔍 [股票代码追踪] 调用 OptimizedChinaDataProvider._generate_fundamentals_report，传入参数: ticker='{ticker}'")
-        fundamentals_data = analyzer._generate_fundamentals_report(ticker, stock_data if 'stock_data' in locals() else "")
-        logger.info(f"🔍 [股票代码追踪] _generate_fundamentals_report 返回结果前200字符: {fundamentals_data[:200] if fundamentals_data else 'None'}")
+        # 复用进程内共享的提供器实例（缓存、配置和API限流状态只初始化一次）
+        analyzer = _resolve("tradingagents.dataflows.optimized_china_data.get_optimized_china_data_provider")()
+        logger.info("🔍 [股票代码追踪] 调用 OptimizedChinaDataProvider._generate_fundamentals_report，传入参数: ticker='%s'", ticker)
+        fundamentals_data = analyzer._generate_fundamentals_report(ticker, stock_data if 'stock_data' in locals() else "", stock_info)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🔍 [股票代码追踪] _generate_fundamentals_report 返回结果前200字符: %s",
+                        fundamentals_data[:200] if fundamentals_data else 'None')
         result_data.append(f"## A股基本面数据\n{fundamentals_data}")
     except Exception as e:
-        logger.error(f"🔍 [股票代码追踪] _generate_fundamentals_report 调用失败: {e}")
-        result_data.append(f"## A股基本面数据\n获取失败: {e}")
+        logger.error("🔍 [股票代码追踪] _generate_fundamentals_report 调用失败: %s", e)
+        result_data.append(f"## A股基本面数据\n{FAILED_SECTION_PREFIX}{e}")
 
     return result_data
 
@@ -56,7 +94,7 @@ def get_hk_data_akshare_wip(ticker: str, start_date: str, end_date: str) -> str:
     Fetches Hong Kong stock data from AKShare. This is the primary data source in original chain, in get_stock_fundamentals_unified_obsoleted()
     取出的只是一些简单的历史信息，完全谈不上基本面
     """
-    from tradingagents.dataflows.akshare_utils import get_hk_stock_data_akshare
+    get_hk_stock_data_akshare = _resolve("tradingagents.dataflows.akshare_utils.get_hk_stock_data_akshare")
     print(f"--- Using AKShare for HK stock data of {ticker} ---")
     return get_hk_stock_data_akshare(ticker, start_date, end_date)
 
@@ -66,7 +104,7 @@ def get_hk_data_yahoo_wip(ticker: str, start_date: str, end_date: str) -> str:
     Fetches Hong Kong stock data from Yahoo Finance. This is the first backup in original chain, in get_stock_fundamentals_unified_obsoleted()
     但是同上面 akshare 的问题一样，取的也是一些简单的历史信息，完全谈不上基本面
     """
-    from tradingagents.dataflows.hk_stock_utils import get_hk_stock_data
+    get_hk_stock_data = _resolve("tradingagents.dataflows.hk_stock_utils.get_hk_stock_data")
     print(f"--- Using Yahoo Finance backup for HK stock data of {ticker} ---")
     return get_hk_stock_data(ticker, start_date, end_date)
 
@@ -77,7 +115,7 @@ def get_hk_data_finnhub_wip(ticker: str, start_date: str, end_date: str) -> str:
     但是同上面 akshare，yahoo 的问题一样，取的也是一些简单的历史信息，完全谈不上基本面
     而且函数里面又充满 fallback，看起来也很混乱
     """
-    from tradingagents.dataflows.optimized_us_data import get_us_stock_data_cached
+    get_us_stock_data_cached = _resolve("tradingagents.dataflows.optimized_us_data.get_us_stock_data_cached")
     print(f"--- Using Finnhub backup for HK stock data of {ticker} ---")
     return get_us_stock_data_cached(ticker, start_date, end_date)
 
@@ -87,7 +125,7 @@ def get_us_data_finnhub(ticker: str, curr_date: str) -> str:
     """
     Fetches US stock fundamentals data from Finnhub. This is the primary data source.
     """
-    from tradingagents.dataflows.interface import get_fundamentals_finnhub
+    get_fundamentals_finnhub = _resolve("tradingagents.dataflows.interface.get_fundamentals_finnhub")
     return get_fundamentals_finnhub(ticker, curr_date)
 
 @tool
@@ -95,7 +133,7 @@ def get_us_data_openai(ticker: str, curr_date: str) -> str:
     """
     Fetches US stock fundamentals data from OpenAI. This is a backup data source.
     """
-    from tradingagents.dataflows.interface import get_fundamentals_openai
+    get_fundamentals_openai = _resolve("tradingagents.dataflows.interface.get_fundamentals_openai")
     return get_fundamentals_openai(ticker, curr_date)
 
 @tool
@@ -103,8 +141,8 @@ def get_us_data_yahoo(ticker: str, curr_date: str, start_date: str, end_date: st
     """
     Fetches and combines Yahoo Finance data, creating a comprehensive report with fundamentals and historical prices.
     """
-    from tradingagents.dataflows.interface import get_fundamentals_yahoo
-    from tradingagents.dataflows.hk_stock_utils import get_hk_stock_data
+    get_fundamentals_yahoo = _resolve("tradingagents.dataflows.interface.get_fundamentals_yahoo")
+    get_hk_stock_data = _resolve("tradingagents.dataflows.hk_stock_utils.get_hk_stock_data")
 
     # 1. Fetch fundamentals and price data
     fundamentals_report = get_fundamentals_yahoo(ticker, curr_date)
@@ -122,6 +160,22 @@ def get_us_data_yahoo(ticker: str, curr_date: str, start_date: str, end_date: st
     return combined_report
 
 # 5. Universal Report Formatting Tool
+FUNDAMENTALS_REPORT_FOOTER = """
+
+---
+*数据来源: 带 fallback 机制的多数据源链*
+
+"""
+
+def _format_report_header(ticker: str, market_info: Dict[str, Any], curr_date: str) -> str:
+    return f"""# {ticker} 基本面分析报告
+
+**市场类型**: {market_info.get('market_name', '未知')}
+**交易货币**: {market_info.get('currency_name', '未知')} ({market_info.get('currency_symbol', '')})
+**报告日期**: {curr_date}
+
+"""
+
 @tool
 def format_fundamentals_report(
     ticker: str, market_info: Dict[str, Any], curr_date: str, results: List[str]
@@ -129,16 +183,37 @@ def format_fundamentals_report(
     """
     Integrates and formats the final fundamentals analysis report from various data pieces.
     """
-    combined_result = f"""# {ticker} 基本面分析报告
+    combined_result = (
+        _format_report_header(ticker, market_info, curr_date)
+        + chr(10).join(results)
+        + FUNDAMENTALS_REPORT_FOOTER
+    )
+    return combined_result
 
-**市场类型**: {market_info.get('market_name', '未知')}
-**交易货币**: {market_info.get('currency_name', '未知')} ({market_info.get('currency_symbol', '')})
-**报告日期**: {curr_date}
+def iter_fundamentals_report(
+    ticker: str, market_info: Dict[str, Any], curr_date: str, results: Callable[[], List[str]]
+) -> Iterator[str]:
+    """
+    Synchronous counterpart of `aiter_fundamentals_report`.
 
-{chr(10).join(results)}
+    `results` is only called after the header has been yielded, so a consumer receives
+    the header before the upstream fetch starts.
+    """
+    yield _format_report_header(ticker, market_info, curr_date)
+    for i, section in enumerate(results()):
+        yield section if i == 0 else chr(10) + section
+    yield FUNDAMENTALS_REPORT_FOOTER
 
----
-*数据来源: 带 fallback 机制的多数据源链*
+async def aiter_fundamentals_report(
+    ticker: str, market_info: Dict[str, Any], curr_date: str, results: Awaitable[List[str]]
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of `format_fundamentals_report`.
 
-"""
-    return combined_result
+    Yields the header immediately, then each section once `results` resolves, then the
+    footer. Joining the chunks gives exactly the `format_fundamentals_report` output.
+    """
+    yield _format_report_header(ticker, market_info, curr_date)
+    for i, section in enumerate(await results):
+        yield section if i == 0 else chr(10) + section
+    yield FUNDAMENTALS_REPORT_FOOTER
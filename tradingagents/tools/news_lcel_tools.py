@@ -7,6 +7,8 @@ composable component that can be used in LangChain chains and agents. These tool
 encapsulate the logic for fetching news from various data sources.
 """
 
+import time
+from functools import lru_cache
 from langchain_core.tools import tool
 from typing import Annotated
 from datetime import datetime
@@ -23,6 +25,20 @@ from tradingagents.dataflows.realtime_news_utils import (
     get_realtime_stock_news as fetch_realtime_stock_news,
 )
 
+# The tools fetch on every call: news reports are cached once, per ticker, by the
+# unified news tool, which also decides how long a report or a failure stays fresh.
+
+
+@lru_cache(maxsize=1)
+def _today(bucket: int) -> str:
+    """Returns the current date string; `bucket` changes once a minute to refresh it."""
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def _curr_date() -> str:
+    """The current date shared by all tool calls within the same minute."""
+    return _today(int(time.time()) // 60)
+
 
 @tool
 def finnhub_news_tool(
@@ -33,7 +49,7 @@ def finnhub_news_tool(
     Fetches company-specific news from Finnhub. Best for US stocks.
     It may return an error message if data is not available locally.
     """
-    curr_date = datetime.now().strftime("%Y-%m-%d")
+    curr_date = _curr_date()
     return fetch_finnhub_news(ticker=ticker, curr_date=curr_date, look_back_days=look_back_days)
 
 
@@ -46,7 +62,7 @@ def google_news_tool(
     Fetches news from Google News based on a ticker.
     This is a reliable source for all market types but may have some delay.
     """
-    curr_date = datetime.now().strftime("%Y-%m-%d")
+    curr_date = _curr_date()
     return fetch_google_news(query=ticker, curr_date=curr_date, look_back_days=look_back_days)
 
 
@@ -60,7 +76,7 @@ def realtime_news_tool(
     This tool is particularly effective for Chinese A-shares as it prioritizes
     sources like East Money (东方财富). It should be the first choice for A-share news.
     """
-    curr_date = datetime.now().strftime("%Y-%m-%d")
+    curr_date = _curr_date()
     return fetch_realtime_stock_news(ticker=ticker, curr_date=curr_date, hours_back=hours_back)
 
 
@@ -72,7 +88,7 @@ def stock_news_openai_tool(
     Uses an OpenAI model with web search capabilities to find recent news and discussions
     on social media about a specific stock.
     """
-    curr_date = datetime.now().strftime("%Y-%m-%d")
+    curr_date = _curr_date()
     return fetch_stock_news_openai(ticker=ticker, curr_date=curr_date)
 
 
@@ -82,5 +98,5 @@ def global_news_openai_tool() -> str:
     Uses an OpenAI model with web search capabilities to find global and macroeconomic news
     that is relevant for trading purposes. This tool is not specific to any single stock.
     """
-    curr_date = datetime.now().strftime("%Y-%m-%d")
+    curr_date = _curr_date()
     return fetch_global_news_openai(curr_date=curr_date)
@@ -1,4 +1,4 @@
-# tradingagents/tools/unified_wrapper.py
+# tradingagents/tools/unified_fundamentals_wrapper.py
 from langchain_core.tools import tool
 from typing import Annotated, Optional
 from tradingagents.chains.fundamentals_data_chain import create_fundamentals_data_chain
@@ -8,7 +8,10 @@ logger = logging.getLogger(__name__)
 
 @tool
 def get_stock_fundamentals_unified(
-    ticker: Annotated[str, "The stock ticker to analyze (e.g., '600519', '0700.HK', 'AAPL')."]
+    ticker: Annotated[str, "The stock ticker to analyze (e.g., '600519', '0700.HK', 'AAPL')."],
+    start_date: Annotated[Optional[str], "Start date in YYYY-MM-DD format (optional)."] = None,
+    end_date: Annotated[Optional[str], "End date in YYYY-MM-DD format (optional)."] = None,
+    curr_date: Annotated[Optional[str], "Current date in YYYY-MM-DD format (optional)."] = None,
 ) -> str:
     """
     A unified tool for fetching stock fundamental data that is backward-compatible with the original interface.
@@ -25,7 +28,7 @@ def get_stock_fundamentals_unified(
                    "For new implementations, consider using the Fundamentals Analyst Agent directly.")
 
     try:
-        # Create an instance of the modern, robust data fetching chain.
+        # Get the modern, robust data fetching chain (built once and cached by the factory).
         fundamentals_data_chain = create_fundamentals_data_chain()
 
         # Invoke the chain. The chain is designed to accept a ticker string as its primary input.
@@ -5,15 +5,45 @@ A simplified, tool-based wrapper for the enhanced news filtering LCEL chain.
 """
 
 import logging
-from typing import Annotated
+from typing import Annotated, Dict, List
 from langchain_core.tools import tool
 import pandas as pd
 
 # Import the composable runnables from the LCEL chain factory
 from tradingagents.chains.news_filter_lcel_chain import fetcher_runnable, enhanced_filter_runnable
+from tradingagents.utils.async_utils import run_coroutine_sync
 
 logger = logging.getLogger(__name__)
 
+# Compose the chain from the imported building blocks once; both blocks are stateless
+# apart from the filter cache, so the composed chain is shared by every call.
+# This mirrors the logic from the second test case in the source file.
+enhanced_chain = fetcher_runnable | enhanced_filter_runnable
+
+
+# Longest article body excerpt included in the report.
+_MAX_CONTENT_CHARS = 300
+
+
+def _format_filtered_news(symbol: str, filtered_df) -> str:
+    """Formats the filtered news DataFrame as a markdown report for the LLM."""
+    if not isinstance(filtered_df, pd.DataFrame) or filtered_df.empty:
+        logger.warning(f"📰 [Filtered News Tool] No news found or returned for {symbol} after filtering.")
+        return f"No relevant news found for {symbol} with the specified criteria."
+
+    logger.info(f"📰 [Filtered News Tool] Successfully filtered {len(filtered_df)} news articles for {symbol}.")
+
+    # Render one compact line per article instead of a full markdown table: it is much
+    # cheaper than `to_markdown` (no tabulate, no per-cell padding) and uses fewer prompt tokens.
+    lines = [
+        f"- [{row.get('发布时间', '')}] {row.get('新闻标题', row.get('标题', ''))} "
+        f"(来源: {row.get('文章来源', '')}, 评分: {row.get('final_score', 0):.1f})\n"
+        f"  {str(row.get('新闻内容', row.get('内容', '')))[:_MAX_CONTENT_CHARS]}"
+        for row in filtered_df.to_dict('records')
+    ]
+    return f"# Enhanced News Analysis Report for {symbol}\n\n" + "\n".join(lines)
+
+
 @tool
 def get_filtered_stock_news(
     symbol: Annotated[str, "The stock ticker symbol for an A-share stock, e.g., '600519', '000001'."],
@@ -31,11 +61,7 @@ def get_filtered_stock_news(
     logger.info(f"📰 [Filtered News Tool] `get_filtered_stock_news` called for symbol: {symbol}")
 
     try:
-        # Step 1: Compose the chain from the imported building blocks.
-        # This mirrors the logic from the second test case in the source file.
-        enhanced_chain = fetcher_runnable | enhanced_filter_runnable
-
-        # Step 2: Prepare the input for the chain.
+        # Step 1: Prepare the input for the chain.
         input_data = {
             "symbol": symbol,
             "max_news": max_news,
@@ -44,27 +70,79 @@ def get_filtered_stock_news(
             "use_local_model": use_local_model
         }
 
-        # Step 3: Invoke the chain synchronously.
+        # Step 2: Invoke the chain synchronously.
         # The chain will fetch news and then pass it to the enhanced filter.
         filtered_df = enhanced_chain.invoke(input_data)
 
-        # Step 4: Format the output for the LLM.
-        if not isinstance(filtered_df, pd.DataFrame) or filtered_df.empty:
-            logger.warning(f"📰 [Filtered News Tool] No news found or returned for {symbol} after filtering.")
-            return f"No relevant news found for {symbol} with the specified criteria."
-
-        logger.info(f"📰 [Filtered News Tool] Successfully filtered {len(filtered_df)} news articles for {symbol}.")
-
-        # Convert the DataFrame to a more readable markdown format.
-        report = f"# Enhanced News Analysis Report for {symbol}\n\n"
-        report += filtered_df.to_markdown(index=False)
-
-        return report
+        # Step 3: Format the output for the LLM.
+        return _format_filtered_news(symbol, filtered_df)
 
     except Exception as e:
         logger.error(f"❌ [Filtered News Tool] An unexpected error occurred for symbol {symbol}: {e}", exc_info=True)
         return f"An error occurred while fetching or filtering news for {symbol}: {e}"
 
+
+async def aget_filtered_stock_news_batch(
+    symbols: List[str],
+    max_news: int = 20,
+    min_score: float = 40.0,
+    use_semantic: bool = True,
+    use_local_model: bool = True,
+    max_concurrency: int = 8,
+) -> Dict[str, str]:
+    """
+    Fetches and filters news for several A-share symbols concurrently.
+
+    Returns a dict mapping each symbol to the same report `get_filtered_stock_news`
+    would produce. The blocking fetches run on worker threads via `abatch`.
+    """
+    inputs = [
+        {
+            "symbol": symbol,
+            "max_news": max_news,
+            "min_score": min_score,
+            "use_semantic": use_semantic,
+            "use_local_model": use_local_model,
+        }
+        for symbol in symbols
+    ]
+    results = await enhanced_chain.abatch(
+        inputs, config={"max_concurrency": max_concurrency}, return_exceptions=True
+    )
+
+    reports = {}
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, Exception):
+            logger.error(f"❌ [Filtered News Tool] An unexpected error occurred for symbol {symbol}: {result}")
+            reports[symbol] = f"An error occurred while fetching or filtering news for {symbol}: {result}"
+        else:
+            reports[symbol] = _format_filtered_news(symbol, result)
+    return reports
+
+
+@tool
+def get_filtered_stock_news_batch(
+    symbols: Annotated[List[str], "The A-share stock ticker symbols to analyze, e.g., ['600519', '000001']."],
+    max_news: Annotated[int, "The maximum number of news articles to fetch per symbol before filtering."] = 20,
+    min_score: Annotated[float, "The minimum relevance score (0-100) for news to be included."] = 40.0,
+    use_semantic: Annotated[bool, "Whether to use semantic analysis in the enhanced filter."] = True,
+    use_local_model: Annotated[bool, "Whether to use a local model in the enhanced filter."] = True,
+) -> Dict[str, str]:
+    """
+    Fetches and filters news for several Chinese A-share stocks at once. Returns a
+    mapping from each symbol to its enhanced news report. Prefer this over calling
+    `get_filtered_stock_news` repeatedly when analyzing a basket of stocks.
+    """
+    logger.info(f"📰 [Filtered News Tool] `get_filtered_stock_news_batch` called for {len(symbols)} symbols")
+    return run_coroutine_sync(aget_filtered_stock_news_batch(
+        symbols,
+        max_news=max_news,
+        min_score=min_score,
+        use_semantic=use_semantic,
+        use_local_model=use_local_model,
+    ))
+
+
 # --- Example Usage ---
 if __name__ == '__main__':
     import asyncio
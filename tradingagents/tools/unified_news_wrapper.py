@@ -4,13 +4,246 @@ Unified News Analysis Tool.
 A simplified, tool-based wrapper for fetching news for any stock.
 """
 
+import asyncio
+import contextvars
 import logging
-from typing import Annotated, Optional
+import queue
+import re
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from time import monotonic, perf_counter
+from typing import Annotated, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+from functools import lru_cache
 from langchain_core.tools import tool
-from tradingagents.chains.news_data_chain import create_news_data_chain
+from tradingagents.chains.news_data_chain import _identify_stock_type, create_news_data_chain
+from tradingagents.utils.result_cache import is_valid_result
+from tradingagents.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    from prometheus_client import Histogram
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+# Finished reports keyed by normalized ticker. Agents ask for the same ticker several
+# times per session; a hit skips the chain entirely, including its input preparation.
+_REPORT_CACHE = TTLCache(maxsize=512, ttl=900)
+_MIN_REPORT_CHARS = 50
+
+# Empty results and errors are remembered briefly, so that an upstream outage does
+# not turn every agent retry into another round of provider calls.
+_NEGATIVE_CACHE = TTLCache(maxsize=1024, ttl=60)
+
+# Deadline for one chain invocation. A hung upstream socket would otherwise hold the
+# tool call (and every caller joined to it) until the HTTP read timeout. It is generous
+# because the OpenAI web search providers legitimately take tens of seconds.
+_FETCH_TIMEOUT = 60.0
+# Sync invocations run here so the caller can stop waiting at the deadline; a stuck
+# worker finishes (or fails) in the background once its HTTP timeout fires.
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="unified-news")
+
+# Per-call latency and cache outcome, so slow markets and cache effectiveness are
+# measurable. `_CACHE_STATS` counts outcomes per market: "hit", "negative", "miss"
+# (this call ran the chain) and "coalesced" (this call waited on another call's fetch).
+_CACHE_STATS: Counter = Counter()
+# Calls are recorded from request threads and `_FETCH_EXECUTOR` workers; `+=` on a
+# Counter is a read-modify-write, so updates and snapshots hold this lock.
+_CACHE_STATS_LOCK = threading.Lock()
+if PROMETHEUS_AVAILABLE:
+    _FETCH_SECONDS = Histogram(
+        "tradingagents_news_fetch_seconds",
+        "Latency of unified news tool calls.",
+        ["market", "cache"],
+    )
+
+# Fetches currently running, keyed like the report cache. Concurrent requests for the
+# same ticker wait for the first one instead of invoking the chain again.
+_INFLIGHT: Dict[str, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+# Shape of any supported ticker ('600519', '0700.HK', 'BRK-B'); anything else is
+# rejected before the chain and its providers are touched.
+_TICKER_PATTERN = re.compile(r"[A-Za-z0-9.\-]{1,12}")
+
+
+def _check_stock_code(stock_code: str) -> Optional[str]:
+    """Returns an error message for a missing or malformed ticker, or None if it is usable."""
+    if not stock_code:
+        return "❌ Error: No stock code provided."
+    if not _TICKER_PATTERN.fullmatch(stock_code):
+        return "❌ Error: Invalid ticker format."
+    return None
+
+
+def _cache_key(stock_code: str) -> str:
+    return stock_code.strip().upper()
+
+
+# zstd contexts are not safe for concurrent use, so each thread gets its own pair.
+_ZSTD_CONTEXTS = threading.local()
+
+
+def _zstd_contexts():
+    if not hasattr(_ZSTD_CONTEXTS, "compressor"):
+        _ZSTD_CONTEXTS.compressor = zstandard.ZstdCompressor(level=3)
+        _ZSTD_CONTEXTS.decompressor = zstandard.ZstdDecompressor()
+    return _ZSTD_CONTEXTS.compressor, _ZSTD_CONTEXTS.decompressor
+
+
+def _get_cached_report(key: str) -> Tuple[Optional[str], str]:
+    """Returns (report, outcome), where outcome is "hit", "negative" or "miss"."""
+    value = _REPORT_CACHE.get(key)
+    if value is not None:
+        logger.debug("[Unified News Tool] Report cache hit for %s", key)
+        if isinstance(value, bytes):
+            value = _zstd_contexts()[1].decompress(value).decode("utf-8")
+        return value, "hit"
+    value = _NEGATIVE_CACHE.get(key)
+    if value is not None:
+        logger.debug("[Unified News Tool] Negative cache hit for %s", key)
+        return value, "negative"
+    return None, "miss"
+
+
+def _record_fetch(stock_code: str, started: float, cache: str) -> None:
+    elapsed = perf_counter() - started
+    market = _identify_stock_type(stock_code)
+    with _CACHE_STATS_LOCK:
+        _CACHE_STATS[(market, cache)] += 1
+    if PROMETHEUS_AVAILABLE:
+        _FETCH_SECONDS.labels(market=market, cache=cache).observe(elapsed)
+    logger.info("news_fetch ticker=%s market=%s ms=%.1f cache=%s", stock_code, market, elapsed * 1000, cache)
+
+
+def get_cache_stats() -> Dict[Tuple[str, str], int]:
+    """Returns the number of unified news calls per (market, cache outcome) so far."""
+    with _CACHE_STATS_LOCK:
+        return dict(_CACHE_STATS)
+
+
+def _cache_report(key: str, report: str) -> None:
+    # This is the only place a finished news report is kept (the chain and the news
+    # tools do not cache), so compressing it here is what shrinks resident memory;
+    # news text compresses several times over when zstandard is installed.
+    if ZSTD_AVAILABLE:
+        _REPORT_CACHE.set(key, _zstd_contexts()[0].compress(report.encode("utf-8")))
+    else:
+        _REPORT_CACHE.set(key, report)
+
+
+def _cache_failure(key: str, message: str) -> None:
+    _NEGATIVE_CACHE.set(key, message)
+
+
+def _join_inflight(key: str):
+    """Returns (future, is_owner); the owner must resolve the future via `_resolve_inflight`."""
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        if future is not None:
+            return future, False
+        future = _INFLIGHT[key] = Future()
+        return future, True
+
+
+def _resolve_inflight(key: str, future: Future, result=None, error: Optional[BaseException] = None) -> None:
+    with _INFLIGHT_LOCK:
+        _INFLIGHT.pop(key, None)
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def _single_flight(key: str, fetch: Callable[[], str]) -> Tuple[str, str]:
+    """Returns (result, outcome): "miss" if this call ran `fetch`, "coalesced" if it joined another."""
+    future, is_owner = _join_inflight(key)
+    if not is_owner:
+        logger.debug("[Unified News Tool] Joining in-flight request for %s", key)
+        return future.result(), "coalesced"
+    try:
+        result = fetch()
+    except BaseException as e:
+        _resolve_inflight(key, future, error=e)
+        raise
+    _resolve_inflight(key, future, result)
+    return result, "miss"
+
+
+async def _asingle_flight(key: str, fetch: Callable[[], Awaitable[str]]) -> Tuple[str, str]:
+    """Async variant of `_single_flight`."""
+    future, is_owner = _join_inflight(key)
+    if not is_owner:
+        logger.debug("[Unified News Tool] Joining in-flight request for %s", key)
+        return await asyncio.wrap_future(future), "coalesced"
+    try:
+        result = await fetch()
+    except BaseException as e:
+        _resolve_inflight(key, future, error=e)
+        raise
+    _resolve_inflight(key, future, result)
+    return result, "miss"
+
+
+@lru_cache(maxsize=256)
+def _empty_notice(stock_code: str) -> str:
+    # Agents retry the same ticker, so the identical notice is shared instead of rebuilt.
+    return f"No significant news found for {stock_code} from available sources."
+
+
+def _store_outcome(stock_code: str, key: str, report: Optional[str]) -> Optional[str]:
+    """
+    Caches the outcome of one chain run; shared by the invoke and stream paths so that
+    both apply the same rules to what ends up in the report and negative caches.
+
+    Returns the notice that replaces a short or empty report, or None if it is usable.
+    """
+    if not report or len(report.strip()) < _MIN_REPORT_CHARS:
+        logger.warning("[Unified News Tool] Result for %s is unusually short or empty.", stock_code)
+        notice = _empty_notice(stock_code)
+        _cache_failure(key, notice)
+        return notice
+
+    # Failure messages from the providers are long enough to pass the check above.
+    if is_valid_result(report):
+        _cache_report(key, report)
+    else:
+        _cache_failure(key, report)
+    return None
+
+
+def _finish_report(stock_code: str, key: str, report: str) -> str:
+    """Replaces empty results with a notice and caches usable reports."""
+    logger.info("📰 [Unified News Tool] Successfully generated news report for %s via LCEL chain.", stock_code)
+    return _store_outcome(stock_code, key, report) or report
+
+
+def _report_error(stock_code: str, e: Exception, key: Optional[str] = None) -> str:
+    logger.error("❌ [Unified News Tool] An unexpected error occurred while running the "
+                 "underlying data chain for %s: %s", stock_code, e, exc_info=True)
+    message = f"在为 {stock_code} 获取新闻数据时，统一接口发生严重错误: {e}"
+    if key is not None:
+        _cache_failure(key, message)
+    return message
+
+
+def _report_timeout(stock_code: str, key: str) -> str:
+    logger.warning("⏱️ [Unified News Tool] News fetch for %s exceeded %.0fs; giving up.", stock_code, _FETCH_TIMEOUT)
+    message = f"⚠️ 获取 {stock_code} 的新闻数据超时（{_FETCH_TIMEOUT:.0f}秒），请稍后重试。"
+    _cache_failure(key, message)
+    return message
+
+
 @tool
 def get_stock_news_unified(
     stock_code: Annotated[str, "The stock ticker to analyze (e.g., '600519', '0700.HK', 'AAPL')."]
@@ -21,30 +254,230 @@ def get_stock_news_unified(
     This tool automatically identifies the stock's market (A-share, HK-share, US-share),
     selects the best data sources, and uses multiple fallbacks to ensure data availability.
     """
-    logger.info(f"📰 [Unified News Tool] `get_stock_news_unified` called for ticker: {stock_code}")
+    logger.info("📰 [Unified News Tool] `get_stock_news_unified` called for ticker: %s", stock_code)
 
-    if not stock_code:
-        return "❌ Error: No stock code provided."
+    stock_code = (stock_code or "").strip()
+    error = _check_stock_code(stock_code)
+    if error:
+        return error
+
+    started = perf_counter()
+    key = _cache_key(stock_code)
+    cached, outcome = _get_cached_report(key)
+    if cached is not None:
+        _record_fetch(stock_code, started, outcome)
+        return cached
+
+    def fetch() -> str:
+        try:
+            # Get the modern, robust data fetching chain (built once and cached by the factory).
+            news_data_chain = create_news_data_chain()
+
+            # Invoke the chain. The chain is designed to accept a dictionary with a ticker.
+            # Copy the context so tracing/callback context vars carry over to the worker.
+            context = contextvars.copy_context()
+            report = _FETCH_EXECUTOR.submit(context.run, news_data_chain.invoke, {"ticker": stock_code}).result(
+                timeout=_FETCH_TIMEOUT
+            )
+            return _finish_report(stock_code, key, report)
+
+        except FuturesTimeoutError:
+            return _report_timeout(stock_code, key)
+        except Exception as e:
+            return _report_error(stock_code, e, key)
+
+    report, outcome = _single_flight(key, fetch)
+    _record_fetch(stock_code, started, outcome)
+    return report
+
+
+async def aget_stock_news_unified(stock_code: str) -> str:
+    """
+    Async counterpart of `get_stock_news_unified` for callers already inside an event loop.
+
+    Uses the chain's `ainvoke`, so concurrent calls overlap their provider requests
+    instead of blocking a thread each.
+    """
+    logger.info("📰 [Unified News Tool] `aget_stock_news_unified` called for ticker: %s", stock_code)
+
+    stock_code = (stock_code or "").strip()
+    error = _check_stock_code(stock_code)
+    if error:
+        return error
+
+    started = perf_counter()
+    key = _cache_key(stock_code)
+    cached, outcome = _get_cached_report(key)
+    if cached is not None:
+        _record_fetch(stock_code, started, outcome)
+        return cached
+
+    async def fetch() -> str:
+        try:
+            report = await asyncio.wait_for(
+                create_news_data_chain().ainvoke({"ticker": stock_code}), _FETCH_TIMEOUT
+            )
+            return _finish_report(stock_code, key, report)
+        except asyncio.TimeoutError:
+            return _report_timeout(stock_code, key)
+        except Exception as e:
+            return _report_error(stock_code, e, key)
+
+    report, outcome = await _asingle_flight(key, fetch)
+    _record_fetch(stock_code, started, outcome)
+    return report
+
+
+async def aget_stock_news_batch(stock_codes: List[str]) -> Dict[str, str]:
+    """
+    Fetches news for several tickers concurrently.
 
+    Returns a dict mapping each ticker to the same report `get_stock_news_unified`
+    would produce, so one failing ticker does not affect the others.
+    """
+    results = await asyncio.gather(
+        *(aget_stock_news_unified(code) for code in stock_codes), return_exceptions=True
+    )
+    return {
+        code: _report_error(code, result) if isinstance(result, Exception) else result
+        for code, result in zip(stock_codes, results)
+    }
+
+
+def _iter_with_deadline(chunks: Callable[[], Iterator[str]], timeout: float) -> Iterator[str]:
+    """
+    Iterates `chunks()` on `_FETCH_EXECUTOR` and yields its items until `timeout` seconds
+    have passed in total, then raises FuturesTimeoutError.
+
+    The producer stops at its next chunk once the consumer has gone away.
+    """
+    items: "queue.Queue[tuple]" = queue.Queue()
+    abandoned = threading.Event()
+    end = object()
+
+    def produce():
+        try:
+            for chunk in chunks():
+                if abandoned.is_set():
+                    return
+                items.put((chunk, None))
+        except BaseException as e:
+            items.put((None, e))
+        else:
+            items.put((end, None))
+
+    # Copy the context so tracing/callback context vars carry over to the worker.
+    _FETCH_EXECUTOR.submit(contextvars.copy_context().run, produce)
+    deadline = monotonic() + timeout
     try:
-        # Create an instance of the modern, robust data fetching chain.
-        news_data_chain = create_news_data_chain()
+        while True:
+            try:
+                chunk, error = items.get(timeout=max(deadline - monotonic(), 0))
+            except queue.Empty:
+                raise FuturesTimeoutError() from None
+            if error is not None:
+                raise error
+            if chunk is end:
+                return
+            yield chunk
+    finally:
+        abandoned.set()
+
 
-        # Invoke the chain. The chain is designed to accept a dictionary with a ticker.
-        report = news_data_chain.invoke({"ticker": stock_code})
+async def _aiter_with_deadline(chunks: AsyncIterator[str], timeout: float) -> AsyncIterator[str]:
+    """Yields from `chunks` until `timeout` seconds have passed in total, then raises asyncio.TimeoutError."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), max(deadline - loop.time(), 0))
+            except StopAsyncIteration:
+                return
+            yield chunk
+    finally:
+        await chunks.aclose()
 
-        logger.info(f"📰 [Unified News Tool] Successfully generated news report for {stock_code} via LCEL chain.")
 
-        if not report or len(report.strip()) < 50:
-             logger.warning(f"[Unified News Tool] Result for {stock_code} is unusually short or empty.")
-             return f"No significant news found for {stock_code} from available sources."
+def stream_stock_news_unified(stock_code: str) -> Iterator[str]:
+    """
+    Streaming counterpart of `get_stock_news_unified`.
 
-        return report
+    Yields the report chunks as the chain produces them, so a consumer that only needs
+    the first headlines can stop early. A cached report is yielded as a single chunk.
+    """
+    stock_code = (stock_code or "").strip()
+    error = _check_stock_code(stock_code)
+    if error:
+        yield error
+        return
 
+    started = perf_counter()
+    key = _cache_key(stock_code)
+    cached, outcome = _get_cached_report(key)
+    if cached is not None:
+        _record_fetch(stock_code, started, outcome)
+        yield cached
+        return
+
+    chunks = []
+    news_data_chain = create_news_data_chain()
+    try:
+        for chunk in _iter_with_deadline(lambda: news_data_chain.stream({"ticker": stock_code}), _FETCH_TIMEOUT):
+            chunks.append(chunk)
+            yield chunk
+    except FuturesTimeoutError:
+        yield _report_timeout(stock_code, key)
+        return
+    except Exception as e:
+        yield _report_error(stock_code, e, key)
+        return
+    finally:
+        # Also recorded when the consumer stops early; latency then covers what was read.
+        _record_fetch(stock_code, started, outcome)
+    # The chunks have already been yielded, so a short report gets the notice appended.
+    notice = _store_outcome(stock_code, key, "".join(chunks))
+    if notice:
+        yield notice
+
+
+async def astream_stock_news_unified(stock_code: str) -> AsyncIterator[str]:
+    """Async variant of `stream_stock_news_unified`, backed by the chain's `astream`."""
+    stock_code = (stock_code or "").strip()
+    error = _check_stock_code(stock_code)
+    if error:
+        yield error
+        return
+
+    started = perf_counter()
+    key = _cache_key(stock_code)
+    cached, outcome = _get_cached_report(key)
+    if cached is not None:
+        _record_fetch(stock_code, started, outcome)
+        yield cached
+        return
+
+    chunks = []
+    try:
+        async for chunk in _aiter_with_deadline(
+            create_news_data_chain().astream({"ticker": stock_code}), _FETCH_TIMEOUT
+        ):
+            chunks.append(chunk)
+            yield chunk
+    except asyncio.TimeoutError:
+        yield _report_timeout(stock_code, key)
+        return
     except Exception as e:
-        logger.error(f"❌ [Unified News Tool] An unexpected error occurred while running the "
-                     f"underlying data chain for {stock_code}: {e}", exc_info=True)
-        return f"在为 {stock_code} 获取新闻数据时，统一接口发生严重错误: {e}"
+        yield _report_error(stock_code, e, key)
+        return
+    finally:
+        # Also recorded when the consumer stops early; latency then covers what was read.
+        _record_fetch(stock_code, started, outcome)
+    # The chunks have already been yielded, so a short report gets the notice appended.
+    notice = _store_outcome(stock_code, key, "".join(chunks))
+    if notice:
+        yield notice
+
 
 if __name__ == "__main__":
     # This block allows the script to be run directly for testing.
@@ -61,13 +494,17 @@ if __name__ == "__main__":
         "AAPL"       # US-share (Apple)
     ]
 
-    for ticker in test_tickers:
-        print(f"\n--- 📰 Report for {ticker} ---")
+    def fetch_report(ticker):
         try:
             # The tool's invoke method expects a dictionary.
-            report = get_stock_news_unified.invoke({"stock_code": ticker})
-            print(report)
+            return get_stock_news_unified.invoke({"stock_code": ticker})
         except Exception as e:
-            print(f"--- ❌ Error fetching report for {ticker}: {e} ---")
+            return f"--- ❌ Error fetching report for {ticker}: {e} ---"
+
+    # The fetches are network-bound, so run them concurrently and print in input order.
+    with ThreadPoolExecutor(max_workers=len(test_tickers)) as executor:
+        for ticker, report in zip(test_tickers, executor.map(fetch_report, test_tickers)):
+            print(f"\n--- 📰 Report for {ticker} ---")
+            print(report)
 
     print("\n--- ✅ Test Complete ---")
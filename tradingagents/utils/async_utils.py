@@ -0,0 +1,18 @@
+"""
+异步辅助函数
+供同步代码调用协程使用，无论当前线程是否已有运行中的事件循环
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_coroutine_sync(coro):
+    """Runs a coroutine to completion from synchronous code, even if a loop is already running."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Called from inside an event loop (e.g. a notebook): run on a helper thread instead.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
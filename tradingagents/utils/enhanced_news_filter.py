@@ -5,16 +5,115 @@
 
 import pandas as pd
 import re
+import os
+import hashlib
 import logging
+import threading
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 import numpy as np
 
 # 导入基础过滤器
 from .news_filter import NewsRelevanceFilter, create_news_filter, get_company_name
+from .ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# 语义相似度模型和本地分类模型
+SEMANTIC_MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"  # 支持中文的轻量级模型
+CLASSIFICATION_MODEL_NAME = "uer/roberta-base-finetuned-chinanews-chinese"
+
+
+# lru_cache 本身不阻止并发未命中时重复计算，加载模型前需持有锁，避免并发请求重复加载大模型
+_MODEL_LOAD_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _load_sentence_model_once(model_name: str):
+    #pip install sentence-transformers
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+@lru_cache(maxsize=1)
+def _load_classification_model_once(model_name: str):
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    return AutoTokenizer.from_pretrained(model_name), AutoModelForSequenceClassification.from_pretrained(model_name)
+
+
+def _load_sentence_model(model_name: str = SEMANTIC_MODEL_NAME):
+    """加载语义相似度模型，进程内所有过滤器实例共享同一份模型"""
+    with _MODEL_LOAD_LOCK:
+        return _load_sentence_model_once(model_name)
+
+
+def _load_classification_model(model_name: str = CLASSIFICATION_MODEL_NAME):
+    """加载本地分类模型及分词器，进程内所有过滤器实例共享同一份模型"""
+    with _MODEL_LOAD_LOCK:
+        return _load_classification_model_once(model_name)
+
+
+# 新闻文本embedding缓存：同一股票短时间内重复查询时新闻高度重合，只对新出现的文本编码
+_EMBEDDING_CACHE_TTL = 24 * 3600
+_EMBEDDING_CACHE = TTLCache(maxsize=20000, ttl=_EMBEDDING_CACHE_TTL)
+
+
+@lru_cache(maxsize=1)
+def _embedding_disk_cache():
+    """设置了 TRADINGAGENTS_CHAIN_CACHE_DIR 且安装了 diskcache 时，返回跨进程共享的embedding缓存"""
+    cache_dir = os.getenv("TRADINGAGENTS_CHAIN_CACHE_DIR")
+    if not cache_dir or not DISKCACHE_AVAILABLE:
+        return None
+    return diskcache.Cache(os.path.join(cache_dir, "news_embeddings"))
+
+
+def _encode_with_cache(model, texts: List[str], model_name: str = SEMANTIC_MODEL_NAME) -> np.ndarray:
+    """
+    带缓存的批量编码，只对缓存未命中的文本调用模型
+
+    Args:
+        model: 语义模型
+        texts: 待编码文本
+        model_name: 模型名称，作为缓存键的一部分
+
+    Returns:
+        np.ndarray: 与 texts 顺序一致的embedding矩阵
+    """
+    disk_cache = _embedding_disk_cache()
+    keys = [hashlib.sha1(f"{model_name}|{text}".encode("utf-8")).hexdigest() for text in texts]
+
+    vectors = [None] * len(texts)
+    misses = []
+    for i, key in enumerate(keys):
+        vector = _EMBEDDING_CACHE.get(key)
+        if vector is None and disk_cache is not None:
+            vector = disk_cache.get(key)
+            if vector is not None:
+                _EMBEDDING_CACHE.set(key, vector)
+        if vector is None:
+            misses.append(i)
+        else:
+            vectors[i] = vector
+
+    if misses:
+        encoded = np.asarray(model.encode([texts[i] for i in misses], batch_size=64))
+        for i, vector in zip(misses, encoded):
+            vectors[i] = vector
+            _EMBEDDING_CACHE.set(keys[i], vector)
+            if disk_cache is not None:
+                disk_cache.set(keys[i], vector, expire=_EMBEDDING_CACHE_TTL)
+
+    logger.debug(f"[增强过滤器] embedding缓存命中 {len(texts) - len(misses)}/{len(texts)}")
+    return np.vstack(vectors)
+
+
 class EnhancedNewsFilter(NewsRelevanceFilter):
     """增强新闻过滤器，集成本地模型和多种过滤策略"""
     
@@ -53,12 +152,9 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             
             # 尝试使用sentence-transformers
             try:
-                #pip install sentence-transformers
-                from sentence_transformers import SentenceTransformer
-                
-                # 使用轻量级中文模型
-                model_name = "paraphrase-multilingual-MiniLM-L12-v2"  # 支持中文的轻量级模型
-                self.sentence_model = SentenceTransformer(model_name)
+                # 使用轻量级中文模型（跨股票共享，只有公司相关的embedding按实例计算）
+                model_name = SEMANTIC_MODEL_NAME
+                self.sentence_model = _load_sentence_model(model_name)
                 
                 # 预计算公司相关的embedding
                 company_texts = [
@@ -88,14 +184,9 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             
             # 尝试使用transformers库的中文分类模型
             try:
-                from transformers import AutoTokenizer, AutoModelForSequenceClassification
-                import torch
-                
-                # 使用轻量级中文文本分类模型
-                model_name = "uer/roberta-base-finetuned-chinanews-chinese"
-                
-                self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-                self.classification_model = AutoModelForSequenceClassification.from_pretrained(model_name)
+                # 使用轻量级中文文本分类模型（跨股票共享）
+                model_name = CLASSIFICATION_MODEL_NAME
+                self.tokenizer, self.classification_model = _load_classification_model(model_name)
                 
                 logger.info(f"[增强过滤器] ✅ 分类模型加载成功: {model_name}")
                 
@@ -203,6 +294,97 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             logger.error(f"[增强过滤器] 本地模型分类失败: {e}")
             return 0
     
+    def calculate_semantic_similarities(self, titles: List[str], contents: List[str]) -> np.ndarray:
+        """
+        批量计算语义相似度评分，一次编码全部新闻并用矩阵乘法计算余弦相似度
+
+        Args:
+            titles: 新闻标题列表
+            contents: 新闻内容列表
+
+        Returns:
+            np.ndarray: 每条新闻的语义相似度评分 (0-100)
+        """
+        if not self.use_semantic or self.sentence_model is None:
+            return np.zeros(len(titles))
+
+        try:
+            texts = [f"{title} {content[:200]}" for title, content in zip(titles, contents)]
+            text_embeddings = _encode_with_cache(self.sentence_model, texts)
+            company_embeddings = np.asarray(self.company_embedding)
+
+            # 归一化后矩阵乘法即为余弦相似度，取与公司相关文本的最高相似度
+            text_embeddings = text_embeddings / np.linalg.norm(text_embeddings, axis=1, keepdims=True)
+            company_embeddings = company_embeddings / np.linalg.norm(company_embeddings, axis=1, keepdims=True)
+            max_similarity = (text_embeddings @ company_embeddings.T).max(axis=1)
+
+            return np.clip(max_similarity * 100, 0, 100)
+
+        except Exception as e:
+            logger.error(f"[增强过滤器] 批量语义相似度计算失败: {e}")
+            return np.zeros(len(titles))
+
+    def classify_news_relevance_batch(self, titles: List[str], contents: List[str], batch_size: int = 16) -> np.ndarray:
+        """
+        批量使用本地模型分类新闻相关性，按批次进行推理
+
+        Args:
+            titles: 新闻标题列表
+            contents: 新闻内容列表
+            batch_size: 每次推理的新闻条数
+
+        Returns:
+            np.ndarray: 每条新闻的分类相关性评分 (0-100)
+        """
+        if not self.use_local_model or self.classification_model is None:
+            return np.zeros(len(titles))
+
+        try:
+            import torch
+
+            context_texts = [
+                f"关于{self.company_name}({self.stock_code})的新闻: {title} {content[:300]}"
+                for title, content in zip(titles, contents)
+            ]
+
+            relevance_probs = []
+            for start in range(0, len(context_texts), batch_size):
+                inputs = self.tokenizer(
+                    context_texts[start:start + batch_size],
+                    return_tensors="pt",
+                    truncation=True,
+                    padding=True,
+                    max_length=512
+                )
+                with torch.no_grad():
+                    probabilities = torch.softmax(self.classification_model(**inputs).logits, dim=-1)
+                # 假设第一个类别是"相关"，与单条分类保持一致
+                relevance_probs.append(probabilities[:, 0].cpu().numpy())
+
+            return np.concatenate(relevance_probs) * 100
+
+        except Exception as e:
+            logger.error(f"[增强过滤器] 本地模型批量分类失败: {e}")
+            return np.zeros(len(titles))
+
+    def _normalized_weights(self) -> Dict[str, float]:
+        """根据启用的评分方法返回归一化后的权重"""
+        base_weights = {
+            'rule': 0.4,
+            'semantic': 0.35,
+            'classification': 0.25
+        }
+
+        active_weights = {'rule': base_weights['rule']}
+        if self.use_semantic:
+            active_weights['semantic'] = base_weights['semantic']
+        if self.use_local_model:
+            active_weights['classification'] = base_weights['classification']
+
+        # 归一化权重，使总和为1
+        total_weight = sum(active_weights.values())
+        return {k: v / total_weight for k, v in active_weights.items()}
+
     def calculate_enhanced_relevance_score(self, title: str, content: str) -> Dict[str, float]:
         """
         计算增强相关性评分（综合多种方法）
@@ -235,24 +417,7 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             scores['classification_score'] = 0
         
         # 4. 综合评分（动态加权平均）
-        base_weights = {
-            'rule': 0.4,
-            'semantic': 0.35,
-            'classification': 0.25
-        }
-
-        active_weights = {'rule': base_weights['rule']}
-        if self.use_semantic:
-            active_weights['semantic'] = base_weights['semantic']
-        if self.use_local_model:
-            active_weights['classification'] = base_weights['classification']
-
-        # 归一化权重，使总和为1
-        total_weight = sum(active_weights.values())
-        if total_weight > 0:
-            normalized_weights = {k: v / total_weight for k, v in active_weights.items()}
-        else:
-            normalized_weights = {}
+        normalized_weights = self._normalized_weights()
 
         # 计算最终得分
         final_score = 0
@@ -289,37 +454,56 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             return news_df
         
         logger.info(f"[增强过滤器] 开始增强过滤，原始数量: {len(news_df)}条，最低评分阈值: {min_score}")
-        
-        filtered_news = []
-        
-        for idx, row in news_df.iterrows():
-            title = row.get('新闻标题', row.get('标题', ''))
-            content = row.get('新闻内容', row.get('内容', ''))
-            
-            # 计算增强评分
-            scores = self.calculate_enhanced_relevance_score(title, content)
-            
-            if scores['final_score'] >= min_score:
-                row_dict = row.to_dict()
-                row_dict.update(scores)  # 添加所有评分信息
-                filtered_news.append(row_dict)
-                
-                logger.debug(f"[增强过滤器] 保留新闻 (综合评分: {scores['final_score']:.1f}): {title[:50]}...")
-            else:
-                logger.debug(f"[增强过滤器] 过滤新闻 (综合评分: {scores['final_score']:.1f}): {title[:50]}...")
-        
+
+        titles = self._text_column(news_df, '新闻标题', '标题')
+        contents = self._text_column(news_df, '新闻内容', '内容')
+
+        # 规则评分逐条计算；语义和分类评分批量计算
+        rule_scores = np.fromiter(
+            (self.calculate_relevance_score(t, c) for t, c in zip(titles, contents)),
+            dtype=float, count=len(titles)
+        )
+        semantic_scores = self.calculate_semantic_similarities(titles, contents) if self.use_semantic else np.zeros(len(titles))
+        classification_scores = self.classify_news_relevance_batch(titles, contents) if self.use_local_model else np.zeros(len(titles))
+
+        normalized_weights = self._normalized_weights()
+        final_scores = (
+            normalized_weights.get('rule', 0) * rule_scores
+            + normalized_weights.get('semantic', 0) * semantic_scores
+            + normalized_weights.get('classification', 0) * classification_scores
+        )
+
+        keep = final_scores >= min_score
+        if logger.isEnabledFor(logging.DEBUG):
+            for title, score, kept in zip(titles, final_scores, keep):
+                action = "保留" if kept else "过滤"
+                logger.debug(f"[增强过滤器] {action}新闻 (综合评分: {score:.1f}): {title[:50]}...")
+
         # 创建过滤后的DataFrame
-        if filtered_news:
-            filtered_df = pd.DataFrame(filtered_news)
+        if keep.any():
+            filtered_df = news_df[keep].reset_index(drop=True).assign(
+                rule_score=rule_scores[keep],
+                semantic_score=semantic_scores[keep],
+                classification_score=classification_scores[keep],
+                final_score=final_scores[keep],
+            )
             # 按综合评分排序
             filtered_df = filtered_df.sort_values('final_score', ascending=False)
             logger.info(f"[增强过滤器] 增强过滤完成，保留 {len(filtered_df)}条 新闻")
         else:
             filtered_df = pd.DataFrame()
             logger.warning(f"[增强过滤器] 所有新闻都被过滤，无符合条件的新闻")
-            
+
         return filtered_df
 
+    @staticmethod
+    def _text_column(news_df: pd.DataFrame, column: str, fallback: str) -> List[str]:
+        """取出新闻文本列（优先使用 column，其次 fallback），缺失时返回空字符串"""
+        for name in (column, fallback):
+            if name in news_df.columns:
+                return news_df[name].fillna('').astype(str).tolist()
+        return [''] * len(news_df)
+
 
 def create_enhanced_news_filter(ticker: str, use_semantic: bool = True, use_local_model: bool = False) -> EnhancedNewsFilter:
     """
@@ -337,6 +521,41 @@ def create_enhanced_news_filter(ticker: str, use_semantic: bool = True, use_loca
     return EnhancedNewsFilter(ticker, company_name, use_semantic, use_local_model)
 
 
+# 模型由所有实例共享，每个过滤器实例只持有公司关键词和公司embedding
+FILTER_CACHE_SIZE = 64
+
+
+# 分段锁：按缓存键哈希选取固定数量的锁之一，同一股票的并发冷启动只创建一次过滤器，
+# 不同股票大多互不阻塞；锁的数量固定，不随股票数增长
+_FILTER_LOCK_STRIPES = 32
+_FILTER_LOCKS = tuple(threading.Lock() for _ in range(_FILTER_LOCK_STRIPES))
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _build_cached_filter(ticker: str, use_semantic: bool, use_local_model: bool) -> EnhancedNewsFilter:
+    logger.info(f"[增强过滤器] 为 {ticker} 创建新的过滤器实例")
+    return create_enhanced_news_filter(ticker, use_semantic, use_local_model)
+
+
+def get_cached_enhanced_news_filter(ticker: str, use_semantic: bool = True, use_local_model: bool = False) -> EnhancedNewsFilter:
+    """
+    获取缓存的增强新闻过滤器，超出容量时淘汰最久未使用的实例
+
+    新闻处理管道和 LCEL 过滤链共享同一份缓存，同一股票和配置只创建一个过滤器。
+
+    Args:
+        ticker: 股票代码
+        use_semantic: 是否使用语义相似度过滤
+        use_local_model: 是否使用本地分类模型
+
+    Returns:
+        EnhancedNewsFilter: 配置好的增强过滤器实例
+    """
+    key = (ticker, use_semantic, use_local_model)
+    with _FILTER_LOCKS[hash(key) % _FILTER_LOCK_STRIPES]:
+        return _build_cached_filter(*key)
+
+
 # 使用示例
 if __name__ == "__main__":
     # 测试增强过滤器
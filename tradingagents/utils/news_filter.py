@@ -11,6 +11,29 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# 排除关键词 - 这些词出现时降低相关性
+EXCLUDE_KEYWORDS = (
+    'etf', '指数基金', '基金', '指数', 'index', 'fund',
+    '权重股', '成分股', '板块', '概念股', '主题基金',
+    '跟踪指数', '被动投资', '指数投资', '基金持仓'
+)
+
+# 包含关键词 - 这些词出现时提高相关性
+INCLUDE_KEYWORDS = (
+    '业绩', '财报', '公告', '重组', '并购', '分红', '派息',
+    '高管', '董事', '股东', '增持', '减持', '回购',
+    '年报', '季报', '半年报', '业绩预告', '业绩快报',
+    '股东大会', '董事会', '监事会', '重大合同',
+    '投资', '收购', '出售', '转让', '合作', '协议'
+)
+
+# 强相关关键词 - 这些词出现时大幅提高相关性
+STRONG_KEYWORDS = (
+    '停牌', '复牌', '涨停', '跌停', '限售解禁',
+    '股权激励', '员工持股', '定增', '配股', '送股',
+    '资产重组', '借壳上市', '退市', '摘帽', 'ST'
+)
+
 class NewsRelevanceFilter:
     """基于规则的新闻相关性过滤器"""
     
@@ -25,28 +48,10 @@ class NewsRelevanceFilter:
         self.stock_code = stock_code.upper()
         self.company_name = company_name
         
-        # 排除关键词 - 这些词出现时降低相关性
-        self.exclude_keywords = [
-            'etf', '指数基金', '基金', '指数', 'index', 'fund',
-            '权重股', '成分股', '板块', '概念股', '主题基金',
-            '跟踪指数', '被动投资', '指数投资', '基金持仓'
-        ]
-        
-        # 包含关键词 - 这些词出现时提高相关性
-        self.include_keywords = [
-            '业绩', '财报', '公告', '重组', '并购', '分红', '派息',
-            '高管', '董事', '股东', '增持', '减持', '回购',
-            '年报', '季报', '半年报', '业绩预告', '业绩快报',
-            '股东大会', '董事会', '监事会', '重大合同',
-            '投资', '收购', '出售', '转让', '合作', '协议'
-        ]
-        
-        # 强相关关键词 - 这些词出现时大幅提高相关性
-        self.strong_keywords = [
-            '停牌', '复牌', '涨停', '跌停', '限售解禁',
-            '股权激励', '员工持股', '定增', '配股', '送股',
-            '资产重组', '借壳上市', '退市', '摘帽', 'ST'
-        ]
+        # 关键词表与股票无关，所有实例共享模块级的只读元组
+        self.exclude_keywords = EXCLUDE_KEYWORDS
+        self.include_keywords = INCLUDE_KEYWORDS
+        self.strong_keywords = STRONG_KEYWORDS
     
     def calculate_relevance_score(self, title: str, content: str) -> float:
         """
@@ -0,0 +1,128 @@
+"""
+链结果缓存
+为 LCEL 数据链提供按键缓存：内存层 (TTLCache) 加可选的磁盘层 (diskcache)，
+空结果和失败结果不会被缓存，供链层复用
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Hashable, Optional
+
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+from tradingagents.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Markers that the dataflows layer uses to report a failure or an empty result
+# inside a normal string result.
+_FAILURE_MARKERS = ("❌", "⚠️", "未获取到", "No news found")
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+_CACHE_DIR_ENV = "TRADINGAGENTS_CHAIN_CACHE_DIR"
+
+
+def is_valid_result(result: Any) -> bool:
+    """Default validator: a non-empty result that is not a failure message."""
+    if not result:
+        return False
+    if isinstance(result, str):
+        return not result.strip().startswith(_FAILURE_MARKERS)
+    return True
+
+
+def _open_disk_cache(name: str):
+    """Opens the optional persistent cache for `name`, or returns None if disabled."""
+    cache_dir = os.getenv(_CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    if not DISKCACHE_AVAILABLE:
+        logger.warning(f"{_CACHE_DIR_ENV} is set but diskcache is not installed; using memory cache only.")
+        return None
+    return diskcache.Cache(os.path.join(cache_dir, name))
+
+
+class _ResultStore:
+    """Memory cache in front of the optional disk cache; results rejected by `validator` are never stored."""
+
+    def __init__(self, name: str, maxsize: int, ttl: float, validator: Callable[[Any], bool] = is_valid_result):
+        self.ttl = ttl
+        self.validator = validator
+        self.memory_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.disk_cache = _open_disk_cache(name)
+
+    def lookup(self, key: Hashable) -> Optional[Any]:
+        value = self.memory_cache.get(key)
+        if value is None and self.disk_cache is not None:
+            value = self.disk_cache.get(key)
+            if value is not None:
+                self.memory_cache.set(key, value)
+        return value
+
+    async def alookup(self, key: Hashable) -> Optional[Any]:
+        # Only the disk layer does file I/O; keep it off the event loop.
+        value = self.memory_cache.get(key)
+        if value is None and self.disk_cache is not None:
+            value = await asyncio.to_thread(self.lookup, key)
+        return value
+
+    def store(self, key: Hashable, value: Any) -> None:
+        if not self.validator(value):
+            return
+        self.memory_cache.set(key, value)
+        if self.disk_cache is not None:
+            self.disk_cache.set(key, value, expire=self.ttl)
+
+    async def astore(self, key: Hashable, value: Any) -> None:
+        if self.disk_cache is None:
+            self.store(key, value)
+        else:
+            await asyncio.to_thread(self.store, key, value)
+
+
+def with_result_cache(
+    chain: Runnable,
+    key_fn: Callable[[Any], Hashable],
+    name: str,
+    maxsize: int = 1024,
+    ttl: float = 3600,
+    validator: Callable[[Any], bool] = is_valid_result,
+) -> Runnable:
+    """
+    Wraps `chain` so that results are cached under `key_fn(input)` for `ttl` seconds.
+
+    Repeated requests are served from memory and, when `TRADINGAGENTS_CHAIN_CACHE_DIR`
+    is set and `diskcache` is installed, from a disk cache shared across processes.
+
+    Results rejected by `validator` (by default empty and failure results) are never
+    cached, so the next request retries the providers.
+    """
+    results = _ResultStore(name, maxsize, ttl, validator)
+
+    def _invoke(x, config: RunnableConfig):
+        key = key_fn(x)
+        cached = results.lookup(key)
+        if cached is not None:
+            logger.debug(f"[{name}] Cache hit for {key}")
+            return cached
+        result = chain.invoke(x, config)
+        results.store(key, result)
+        return result
+
+    async def _ainvoke(x, config: RunnableConfig):
+        key = key_fn(x)
+        cached = await results.alookup(key)
+        if cached is not None:
+            logger.debug(f"[{name}] Cache hit for {key}")
+            return cached
+        result = await chain.ainvoke(x, config)
+        await results.astore(key, result)
+        return result
+
+    return RunnableLambda(_invoke, afunc=_ainvoke, name=name)
+
@@ -4,6 +4,7 @@
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, Tuple, Optional
 from enum import Enum
 
@@ -20,10 +21,18 @@ class StockMarket(Enum):
     UNKNOWN = "unknown"      # 未知
 
 
+# 市场识别规则合并为一个预编译的正则，分组名与 StockMarket 的取值一致：
+# A股为6位数字；港股为4-5位数字.HK（支持0700.HK和09988.HK格式）；美股为1-5位字母
+_MARKET_PATTERN = re.compile(r'(?P<china_a>\d{6})|(?P<hong_kong>\d{4,5}\.HK)|(?P<us>[A-Z]{1,5})')
+_HK_PLAIN_PATTERN = re.compile(r'^\d{4,5}$')
+_HK_SUFFIX_PATTERN = re.compile(r'^\d{4,5}\.HK$')
+
+
 class StockUtils:
     """股票工具类"""
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def identify_stock_market(ticker: str) -> StockMarket:
         """
         识别股票代码所属市场
@@ -38,20 +47,9 @@ class StockUtils:
             return StockMarket.UNKNOWN
             
         ticker = str(ticker).strip().upper()
-        
-        # 中国A股：6位数字
-        if re.match(r'^\d{6}$', ticker):
-            return StockMarket.CHINA_A
 
-        # 港股：4-5位数字.HK（支持0700.HK和09988.HK格式）
-        if re.match(r'^\d{4,5}\.HK$', ticker):
-            return StockMarket.HONG_KONG
-
-        # 美股：1-5位字母
-        if re.match(r'^[A-Z]{1,5}$', ticker):
-            return StockMarket.US
-            
-        return StockMarket.UNKNOWN
+        match = _MARKET_PATTERN.fullmatch(ticker)
+        return StockMarket(match.lastgroup) if match else StockMarket.UNKNOWN
     
     @staticmethod
     def is_china_stock(ticker: str) -> bool:
@@ -153,11 +151,11 @@ class StockUtils:
         ticker = str(ticker).strip().upper()
         
         # 如果是纯4-5位数字，添加.HK后缀
-        if re.match(r'^\d{4,5}$', ticker):
+        if _HK_PLAIN_PATTERN.match(ticker):
             return f"{ticker}.HK"
 
         # 如果已经是正确格式，直接返回
-        if re.match(r'^\d{4,5}\.HK$', ticker):
+        if _HK_SUFFIX_PATTERN.match(ticker):
             return ticker
             
         return ticker
@@ -0,0 +1,83 @@
+"""
+轻量级内存缓存
+提供线程安全、容量有界 (LRU) 且带过期时间 (TTL) 的键值缓存，供链和工具层复用
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """线程安全的 LRU + TTL 缓存"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        """
+        初始化缓存
+
+        Args:
+            maxsize: 最大条目数，超出后淘汰最久未使用的条目
+            ttl: 默认过期时间（秒）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        获取缓存值，过期或不存在时返回 default
+
+        Args:
+            key: 缓存键
+            default: 未命中时的返回值
+
+        Returns:
+            Any: 缓存值或 default
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        写入缓存值
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 该条目的过期时间（秒），默认使用缓存的 ttl
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """删除并返回缓存值"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        sentinel = object()
+        return self.get(key, sentinel) is not sentinel
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)